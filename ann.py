@@ -10,22 +10,62 @@ import numpy as np
 class ANNController:
     '''
     Controller for the ANN that will be used to control the agent in the environment.
+    The weights live in one contiguous genome buffer and the three weight matrices are views
+    into it. self.genome is that live buffer, get_weights() returns a copy of it.
     '''
-    def __init__(self, input_size, hidden_size, output_size):
+    def __init__(self, input_size, hidden_size, output_size, genome=None):
         '''
         Initialize the controller with the given input, hidden, and output sizes.
+        If genome is given the controller wraps that buffer (for example a row of a population
+        matrix or shared memory) instead of allocating random weights, writes go to the buffer.
         '''
         self.input_size = input_size
         self.hidden_size = hidden_size
         self.output_size = output_size
+        if genome is None:
+            genome = np.random.randn(self.num_weights())
+        elif genome.shape != (self.num_weights(),) or genome.dtype != np.float64 \
+                or not genome.flags.c_contiguous:
+            raise ValueError(f"genome must be a contiguous float64 buffer of {self.num_weights()} weights")
+        self._bind(genome)
+        # Initial hidden state
+        self.hidden_state = np.zeros(self.hidden_size)
+
+
+    def num_weights(self):
+        '''
+        Number of weights in the genome.
+        '''
+        return self.hidden_size * (self.input_size + self.hidden_size + self.output_size)
+
+
+    def _bind(self, genome):
+        '''
+        Expose the weight matrices as views into the genome buffer.
+        '''
+        input_hidden_size = self.input_size * self.hidden_size
+        hidden_hidden_size = self.hidden_size * self.hidden_size
+        self.genome = genome
         # Weights from input to hidden layer
-        self.weights_input_hidden = np.random.randn(self.input_size, self.hidden_size)
+        self.weights_input_hidden = genome[:input_hidden_size].reshape((self.input_size, self.hidden_size))
         # Recurrent weights within the hidden layer for memory
-        self.weights_hidden_hidden = np.random.randn(self.hidden_size, self.hidden_size)
+        self.weights_hidden_hidden = genome[input_hidden_size:input_hidden_size + hidden_hidden_size].reshape((self.hidden_size, self.hidden_size))
         # Weights from hidden layer to output layer
-        self.weights_hidden_output = np.random.randn(self.hidden_size, self.output_size)
-        # Initial hidden state
-        self.hidden_state = np.zeros(self.hidden_size)
+        self.weights_hidden_output = genome[input_hidden_size + hidden_hidden_size:].reshape((self.hidden_size, self.output_size))
+
+
+    def __getstate__(self):
+        '''
+        Pickle only the genome, the views are rebuilt when unpickling.
+        '''
+        state = self.__dict__.copy()
+        del state["weights_input_hidden"], state["weights_hidden_hidden"], state["weights_hidden_output"]
+        return state
+
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind(self.genome)
 
     
     def forward(self, inputs):
@@ -50,21 +90,125 @@ class ANNController:
     
     def get_weights(self):
         '''
-        Get the weights of the network as a single numpy array.
+        Get a copy of the weights of the network as a single numpy array,
+        use self.genome to read or write the weights in place.
         '''
-        return np.concatenate((self.weights_input_hidden.flatten(), self.weights_hidden_hidden.flatten(), self.weights_hidden_output.flatten()))
+        return self.genome.copy()
     
     
     def set_weights(self, weights):
         '''
-        Set the weights of the network from a single numpy array.
+        Set the weights of the network from a single numpy array, copied into the genome buffer.
+        Weights after the first num_weights() are ignored, like the slicing of the weight
+        matrices always did, a shorter array raises a ValueError.
+        '''
+        weights = np.asarray(weights, dtype=float).ravel()
+        if len(weights) < self.num_weights():
+            raise ValueError(f"expected {self.num_weights()} weights, got {len(weights)}")
+        self.genome[:] = weights[:self.num_weights()]
+
+
+class PopulationController:
+    '''
+    Controllers of a whole population with the weights stacked into 3-D arrays, so the forward
+    step of all P individuals is one batched matrix multiplication instead of P small ones.
+    The weights live in one (P, n_weights) genome matrix and the 3-D arrays are views into it.
+    '''
+    def __init__(self, population_size, input_size, hidden_size, output_size, genomes=None):
+        '''
+        Initialize P controllers with random weights (or wrapping the given genome matrix)
+        and zero hidden states.
+        '''
+        self.population_size = population_size
+        self.input_size = input_size
+        self.hidden_size = hidden_size
+        self.output_size = output_size
+        num_weights = hidden_size * (input_size + hidden_size + output_size)
+        if genomes is None:
+            genomes = np.random.randn(population_size, num_weights)
+        elif genomes.shape != (population_size, num_weights) or genomes.dtype != np.float64 \
+                or not genomes.flags.c_contiguous:
+            raise ValueError(f"genomes must be a contiguous float64 array of shape {(population_size, num_weights)}")
+        self._bind(genomes)
+        self.hidden_state = np.zeros((population_size, hidden_size))
+
+
+    def _bind(self, genomes):
+        '''
+        Expose the stacked weight matrices as views into the genome matrix.
         '''
         input_hidden_size = self.input_size * self.hidden_size
         hidden_hidden_size = self.hidden_size * self.hidden_size
-        hidden_output_size = self.hidden_size * self.output_size
+        self.genomes = genomes
+        self.weights_input_hidden = genomes[:, :input_hidden_size].reshape((self.population_size, self.input_size, self.hidden_size))
+        self.weights_hidden_hidden = genomes[:, input_hidden_size:input_hidden_size + hidden_hidden_size].reshape((self.population_size, self.hidden_size, self.hidden_size))
+        self.weights_hidden_output = genomes[:, input_hidden_size + hidden_hidden_size:].reshape((self.population_size, self.hidden_size, self.output_size))
 
-        self.weights_input_hidden = weights[:input_hidden_size].reshape((self.input_size, self.hidden_size))
-        self.weights_hidden_hidden = weights[input_hidden_size:input_hidden_size + hidden_hidden_size].reshape((self.hidden_size, self.hidden_size))
-        self.weights_hidden_output = weights[input_hidden_size + hidden_hidden_size:input_hidden_size + hidden_hidden_size + hidden_output_size].reshape((self.hidden_size, self.output_size))
 
-    
\ No newline at end of file
+    @classmethod
+    def from_controllers(cls, controllers):
+        '''
+        Stack the weights and hidden states of a list of ANNControllers of the same sizes.
+        '''
+        first = controllers[0]
+        population = cls(len(controllers), first.input_size, first.hidden_size, first.output_size)
+        population.set_weights(np.stack([controller.genome for controller in controllers]))
+        population.hidden_state = np.stack([controller.hidden_state for controller in controllers]).astype(float)
+        return population
+
+
+    def forward(self, inputs):
+        '''
+        Calculate the outputs of all the networks, inputs has one row per individual.
+        '''
+        inputs = np.asarray(inputs, dtype=float)[:, None, :]
+        hidden_state = self.hidden_state[:, None, :]
+        # Calculate the hidden states with recurrent connection
+        hidden_state = self.sigmoid(np.matmul(inputs, self.weights_input_hidden) + np.matmul(hidden_state, self.weights_hidden_hidden))
+        self.hidden_state = hidden_state[:, 0, :]
+        # Calculate the outputs
+        return self.sigmoid(np.matmul(hidden_state, self.weights_hidden_output))[:, 0, :]
+
+
+    def reset(self):
+        '''
+        Reset the hidden states of all the networks.
+        '''
+        self.hidden_state = np.zeros((self.population_size, self.hidden_size))
+
+
+    def sigmoid(self, x):
+        '''
+        Sigmoid activation function.
+        '''
+        # Clip the values to avoid overflow
+        x = np.clip(x, -500, 500)
+        return 1 / (1 + np.exp(-x))
+
+
+    def get_weights(self):
+        '''
+        Get a copy of the weights of the networks as the (P, n_weights) genome matrix (self.genomes
+        is the live matrix), row i is laid out like ANNController.get_weights so it can be saved
+        and loaded as a single genome.
+        '''
+        return self.genomes.copy()
+
+
+    def set_weights(self, weights):
+        '''
+        Set the weights of the networks from a (P, n_weights) array of genomes, a single genome
+        (for example loaded from a .npy file) is used for every individual.
+        '''
+        if weights is not self.genomes:
+            self.genomes[:] = weights
+
+
+    def controller(self, index):
+        '''
+        Return individual index as an ANNController wrapping row index of the genome matrix.
+        '''
+        controller = ANNController(self.input_size, self.hidden_size, self.output_size,
+                                   genome=self.genomes[index])
+        controller.hidden_state = self.hidden_state[index].copy()
+        return controller
@@ -0,0 +1,189 @@
+"""
+batch_sim.py: Structure-of-arrays simulator stepping many robots in lockstep in one maze.
+"""
+
+import math
+import numpy as np
+
+from maze import Maze
+from config.maze_config import CELL_SIZE, WIDTH, HEIGHT
+from config.robot_config import (ROBOT_RADIUS, NUM_SENSORS, SENSOR_MAX_DISTANCE,
+                                 WHEEL_NOISE_DEFAULT, SENSOR_NOISE_DEFAULT, VISIBILITY_MODEL_DEFAULT)
+from config.kalman_config import (NOISE_COVARIANCE_MEASUREMENT_FALSE, NOISE_COVARIANCE_MEASUREMENT_TRUE,
+                                  NOISE_COVARIANCE_X, NOISE_COVARIANCE_Y, NOISE_COVARIANCE_THETA,
+                                  KALMAN_CORRECTION_DEFAULT)
+from kalman_filter import KalmanFilterBank
+from forward_kin import grid_collision_flags, batch_motion_without_collision
+from raycast import dda_raycast, line_of_sight
+
+
+class RobotBatch:
+    """
+    N robots sharing one maze, with their state held in numpy arrays.
+    The robots follow the same dynamics as Robot with the "grid" collision model and the
+    "dda" sensor model, but every step is one vectorized call for the whole batch.
+    """
+
+    def __init__(self, maze: Maze, start_pos, num_robots, wheel_noise=WHEEL_NOISE_DEFAULT,
+                 rng=None):
+        """
+        Initialize the batch.
+        :param maze: Maze object shared by all the robots.
+        :param start_pos: Tuple (x, y) for the starting position of every robot.
+        :param num_robots: Number of robots in the batch.
+        :param wheel_noise: Relative uniform noise applied to the wheel speeds.
+        :param rng: numpy.random.Generator used for the wheel noise.
+        """
+        self.maze = maze
+        self.start_pos = start_pos
+        self.num_robots = num_robots
+        self.wheel_noise = wheel_noise
+        self.sensor_noise = SENSOR_NOISE_DEFAULT
+        self.kalman_correction = KALMAN_CORRECTION_DEFAULT
+        self.visibility_model = VISIBILITY_MODEL_DEFAULT # "grid" or "table", see Robot
+        self.kalman_bank = None # built on the first run_kalman_filter
+        self.beacon_count = np.zeros(num_robots, dtype=int)
+        self.rng = np.random.default_rng() if rng is None else rng
+
+        self.x = np.empty(num_robots)
+        self.y = np.empty(num_robots)
+        self.angle = np.empty(num_robots)
+        self.vl = np.empty(num_robots)
+        self.vr = np.empty(num_robots)
+        self.sensors = np.empty((num_robots, NUM_SENSORS))
+        self.explored_grid = np.empty((num_robots, HEIGHT // CELL_SIZE, WIDTH // CELL_SIZE),
+                                      dtype=bool)
+        self.explored_count = np.empty(num_robots, dtype=int)
+        self.reset()
+
+
+    def reset(self):
+        """Reset all the robots to the starting position."""
+        self.x[:], self.y[:] = self.start_pos
+        self.angle[:] = 0
+        self.vl[:] = 0
+        self.vr[:] = 0
+        self.explored_grid[:] = False
+        self.explored_count[:] = 0
+        self.kalman_bank = None
+        self.beacon_count[:] = 0
+        self._mark_explored()
+        self.update_sensors()
+
+
+    def update_sensors(self):
+        """
+        Update the sensor readings of all the robots with one batch of rays.
+        """
+        sensor_angles = self.angle[:, None] + np.arange(NUM_SENSORS) * (2 * math.pi / NUM_SENSORS)
+        self.sensors = dda_raycast(self.maze.occupancy(), CELL_SIZE, self.x[:, None],
+                                   self.y[:, None], sensor_angles, SENSOR_MAX_DISTANCE,
+                                   start_offset=ROBOT_RADIUS)
+
+
+    def move_with_diff_drive(self, vl, vr):
+        """
+        Move all the robots with differential drive control.
+        :param vl: Array with the left wheel speed of every robot.
+        :param vr: Array with the right wheel speed of every robot.
+        """
+        vl = np.asarray(vl, dtype=float)
+        vr = np.asarray(vr, dtype=float)
+
+        # apply noise to the wheel power
+        self.vl = vl + self.rng.uniform(-1, 1, self.num_robots) * vl * self.wheel_noise
+        self.vr = vr + self.rng.uniform(-1, 1, self.num_robots) * vr * self.wheel_noise
+
+        # detect collisions before the move, like forward_kin.motion_with_grid_collision
+        blocked = grid_collision_flags(self.x, self.y, self.maze.occupancy(), CELL_SIZE)
+        states = np.stack([self.x, self.y, self.angle, self.vl, self.vr], axis=-1)
+        x, y, angle = batch_motion_without_collision(states, 1)
+
+        # block the movement towards the walls (NORTH, SOUTH, EAST, WEST)
+        y = np.where(blocked[:, 0], np.maximum(self.y, y), y)
+        y = np.where(blocked[:, 1], np.minimum(self.y, y), y)
+        x = np.where(blocked[:, 2], np.minimum(self.x, x), x)
+        x = np.where(blocked[:, 3], np.maximum(self.x, x), x)
+
+        # Check for collision with the outer edges of the window
+        self.x = np.clip(x, ROBOT_RADIUS, WIDTH - ROBOT_RADIUS)
+        self.y = np.clip(y, ROBOT_RADIUS, HEIGHT - ROBOT_RADIUS)
+        self.angle = angle
+
+        self._mark_explored()
+
+
+    def run_kalman_filter(self, vl, vr):
+        """
+        Localize all the robots with one bank of Kalman filters, like Robot.run_kalman_filter.
+        :param vl: Array with the left wheel speed of every robot.
+        :param vr: Array with the right wheel speed of every robot.
+        """
+        landmarks = np.asarray(self.maze.landmarks, dtype=float).reshape(-1, 2)
+        if self.kalman_bank is None:
+            self.kalman_bank = KalmanFilterBank(
+                np.eye(3), np.zeros((3, 2)),
+                np.diag([NOISE_COVARIANCE_X, NOISE_COVARIANCE_Y, NOISE_COVARIANCE_THETA]),
+                np.eye(2 * len(landmarks)),
+                np.stack([np.full(self.num_robots, float(self.start_pos[0])),
+                          np.full(self.num_robots, float(self.start_pos[1])),
+                          np.zeros(self.num_robots)], axis=1),
+                np.eye(3))
+        self.kalman_bank.predict(np.stack([np.broadcast_to(vl, self.num_robots),
+                                           np.broadcast_to(vr, self.num_robots)], axis=1))
+
+        # noisy bearing and distance from every robot to every landmark
+        visible = self.visible_landmarks()
+        dx = landmarks[None, :, 0] - self.x[:, None]
+        dy = landmarks[None, :, 1] - self.y[:, None]
+        distance = np.sqrt(dx ** 2 + dy ** 2)
+        bearing = np.arctan2(dy, dx) - self.angle[:, None]
+        distance += self.rng.uniform(-1, 1, distance.shape) * distance * self.sensor_noise
+        bearing += self.rng.uniform(-1, 1, bearing.shape) * bearing * self.sensor_noise
+        measurements = np.empty((self.num_robots, 2 * len(landmarks)))
+        measurements[:, 0::2] = bearing
+        measurements[:, 1::2] = distance
+        self.beacon_count = visible.sum(axis=1)
+
+        # default uncertainty for the visible landmarks, high uncertainty for the others
+        noise = np.where(visible, NOISE_COVARIANCE_MEASUREMENT_TRUE,
+                         NOISE_COVARIANCE_MEASUREMENT_FALSE)
+        rows = np.arange(2 * len(landmarks))
+        self.kalman_bank.noise_covariance_measurement[:, rows, rows] = np.repeat(noise, 2, axis=1)
+
+        if self.kalman_correction == "visible":
+            self.kalman_bank.correct(measurements, landmarks, visible)
+        elif self.kalman_correction == "full":
+            self.kalman_bank.correct(measurements, landmarks)
+        else:
+            raise ValueError(f"Unknown Kalman correction: {self.kalman_correction}")
+        return self.kalman_bank.state_estimates
+
+
+    def visible_landmarks(self):
+        """
+        Check the line of sight from every robot to every landmark.
+        :return: Boolean numpy array (robots x landmarks), True for the landmarks in line of sight.
+        """
+        if self.visibility_model == "table":
+            return self.maze.landmark_visibility().query_many(self.x, self.y)
+        if self.visibility_model != "grid":
+            raise ValueError(f"Unknown visibility model: {self.visibility_model}")
+        landmarks = np.asarray(self.maze.landmarks, dtype=float).reshape(-1, 2)
+        return line_of_sight(self.maze.occupancy(), CELL_SIZE, self.x[:, None], self.y[:, None],
+                             landmarks[None, :, 0], landmarks[None, :, 1])
+
+
+    def calculate_explored_area(self):
+        """Return the number of cells explored by every robot."""
+        return self.explored_count.copy()
+
+
+    def _mark_explored(self):
+        """Mark the cells under the robots as explored and update the counts."""
+        grid_x = (self.x // CELL_SIZE).astype(int)
+        grid_y = (self.y // CELL_SIZE).astype(int)
+        robots = np.arange(self.num_robots)
+        self.explored_count += ~self.explored_grid[robots, grid_y, grid_x]
+        self.explored_grid[robots, grid_y, grid_x] = True
+
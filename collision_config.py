@@ -3,7 +3,6 @@
    these need to be updated every time the ROBOT_RADIUS is changed"""
 
 import numpy as np
-from collison_calibration import run_calibration
 
 # update these values when ROBOT_RADIUS is changed
 NORTH = (10,0)
@@ -17,4 +16,5 @@ max_y = max(NORTH[1], SOUTH[1], EAST[1], WEST[1])
 CENTER = np.array((max_x // 2, max_y // 2))
 
 if __name__ == '__main__':
+    from collison_calibration import run_calibration
     run_calibration()
@@ -2,14 +2,9 @@
 #pylint: disable=no-member
 import pygame
 from config.robot_config import ROBOT_RADIUS
+from mask_cache import MASK_CACHE
 
-# Initialize Pygame
-pygame.init()
-
-# Set up the display
 window_size = (400, 300)
-screen = pygame.display.set_mode(window_size)
-pygame.display.set_caption("Collision checker")
 
 # Set up the colors
 RED = (255, 0, 0)
@@ -21,18 +16,18 @@ rect_pos = (150, 50)
 rect_size = (100, 50)
 rectangle = pygame.Rect(rect_pos, rect_size)
 
-# Create surfaces for masks
-dot_surface = pygame.Surface((ROBOT_RADIUS*2, ROBOT_RADIUS*2), pygame.SRCALPHA)
-pygame.draw.circle(dot_surface, RED, (ROBOT_RADIUS, ROBOT_RADIUS), ROBOT_RADIUS)
-dot_mask = pygame.mask.from_surface(dot_surface)
-
-rect_surface = pygame.Surface(rect_size)
-rect_surface.fill(GREEN)
-rect_mask = pygame.mask.from_surface(rect_surface)
+# Get the masks shared with the collision detection
+dot_mask = MASK_CACHE.robot_mask(ROBOT_RADIUS)
+rect_mask = MASK_CACHE.wall_mask(*rect_size)
 
 def run_calibration():
     """Run this function to report the mask pixel at which the collision occurs.
        manualy move the robot to collide with the rectangle and print the collision coordinates."""
+    # Initialize Pygame and set up the display, only when the calibration is run
+    pygame.init()
+    screen = pygame.display.set_mode(window_size)
+    pygame.display.set_caption("Collision checker")
+
     # Game loop
     running = True
     input_vector = [0, 0]
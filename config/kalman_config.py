@@ -4,3 +4,14 @@ NOISE_COVARIANCE_MEASUREMENT_TRUE = 0.0000000001
 NOISE_COVARIANCE_X = 0.1
 NOISE_COVARIANCE_Y = 0.1
 NOISE_COVARIANCE_THETA = 0.1
+
+# "visible": correct with the landmarks in line of sight only, cost grows with the visible
+# landmarks; "full": correct with every landmark and a high measurement noise for the occluded ones
+KALMAN_CORRECTION_DEFAULT = "full"
+
+# "kalman": extended Kalman filter, "particle": particle filter (particle_filter.py)
+LOCALIZER_DEFAULT = "kalman"
+PARTICLE_COUNT = 10000
+PARTICLE_INITIAL_STD = (2.0, 2.0, 0.02) # spread of the particles around the start [x, y, theta]
+PARTICLE_DISTANCE_STD = 10.0 # pixels, the sensor noise is relative to the landmark distance
+PARTICLE_BEARING_STD = 0.05 # radians
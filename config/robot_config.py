@@ -14,3 +14,22 @@ ROBOT_SPEED = 2
 SENSOR_NOISE_DEFAULT = 0.01
 WHEEL_NOISE_DEFAULT = 0.1
 KALMAN_CALL_INTERVAL = 15
+# "step": per pixel python loop, "batch": vectorized raycasting, "dda": exact grid traversal,
+# "table": precomputed lookup table of the maze
+SENSOR_MODEL_DEFAULT = "step"
+SENSOR_TABLE_RESOLUTION = 4 # pixels between two sample positions of the lookup table
+SENSOR_TABLE_ANGLE_BINS = 360
+SENSOR_TABLE_MAX_BYTES = 256 * 1024 * 1024
+SENSOR_TABLE_INTERPOLATE = False
+# "mask": pygame mask overlap with calibrated directions, "grid": analytic circle vs grid test,
+# "grid" keeps the simulation free of pygame but its collisions differ slightly from "mask", so it
+# is opt-in: switching changes the fitness of the existing genomes and training runs
+COLLISION_MODEL_DEFAULT = "mask"
+MASK_CACHE_SIZE = 32 # maximum number of prebuilt wall and robot collision masks
+TRAJECTORY_CAPACITY = 60 * 60 * 5 # steps of path history kept by the interactive games (5 minutes at 60 fps)
+# "grid": exact grid traversal, "clip": clip the line of sight against every wall rectangle,
+# "table": precomputed landmark visibility per sample position of the maze, one lookup per query
+# but approximate at the shadow edges (~0.4% of the answers differ from "grid") and built on the
+# first use of a maze (~0.35 s), opt-in for long training runs on a fixed maze
+VISIBILITY_MODEL_DEFAULT = "grid"
+LANDMARK_VISIBILITY_RESOLUTION = 5 # pixels between two sample positions of the visibility table
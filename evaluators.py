@@ -0,0 +1,182 @@
+'''
+This file contains the evaluators that turn a matrix of genomes (one row per individual) into a
+vector of fitness scores: one controller at a time, on a pool of worker processes, or as one
+batched rollout of the whole population. after a call, truncated tells which rollouts were
+stopped early (only the serial evaluator supports early stopping)
+'''
+import random
+import multiprocessing
+import numpy as np
+from ann import ANNController, PopulationController
+from fitness import fitness, fitness_batch, FITNESS_STEPS
+from batch_sim import RobotBatch
+
+
+class SerialEvaluator:
+    '''
+    evaluate the genomes one after the other in this process
+    '''
+    def __init__(self, robot, sizes, seed=None, recorder=None, early_stopping=None,
+                 steps=FITNESS_STEPS):
+        '''
+        sizes is the (input, hidden, output) sizes of the controllers, if a seed is given the
+        random generators are reseeded with it before every rollout, with a
+        recorder.TrajectoryRecorder every rollout is recorded, with a fitness.EarlyStopping
+        policy the rollouts can be stopped early and self.truncated tells which ones were,
+        steps is the length of the rollouts
+        '''
+        self.robot = robot
+        self.sizes = sizes
+        self.seed = seed
+        self.recorder = recorder
+        self.early_stopping = early_stopping
+        self.steps = steps
+        self.truncated = []
+
+
+    def __call__(self, genomes):
+        self.truncated = []
+        return np.array([self.evaluate(genome) for genome in genomes])
+
+
+    def evaluate(self, genome):
+        '''
+        evaluate a single genome
+        '''
+        if self.seed is None:
+            score = fitness(self.robot, _controller(genome, self.sizes), self.steps,
+                            self.early_stopping, self.recorder)
+        else:
+            score = seeded_fitness(self.robot, genome, self.sizes, self.seed,
+                                   self.early_stopping, self.recorder, self.steps)
+        self.truncated.append(self.early_stopping is not None and self.early_stopping.last_stopped)
+        return score
+
+
+    def close(self):
+        '''
+        flush the recorder
+        '''
+        if self.recorder is not None:
+            self.recorder.flush()
+
+
+class PoolEvaluator:
+    '''
+    evaluate the genomes in parallel on a pool of worker processes, every rollout is seeded so
+    the scores do not depend on the worker that computes them
+    '''
+    def __init__(self, robot, sizes, workers=None, seed=None, steps=FITNESS_STEPS):
+        '''
+        workers is the number of processes (all the cpus by default), a random seed is drawn
+        if none is given, steps is the length of the rollouts
+        '''
+        self.robot = robot
+        self.sizes = sizes
+        self.workers = workers
+        self.seed = int(np.random.randint(2**31)) if seed is None else seed
+        self.steps = steps
+        self.pool = None
+
+
+    def __call__(self, genomes):
+        if self.pool is None:
+            # every worker gets its own copy of the robot and maze once, not once per task
+            self.pool = multiprocessing.Pool(self.workers, initializer=_init_worker,
+                                             initargs=(self.robot,))
+        tasks = [(genome, self.sizes, self.seed, self.steps) for genome in genomes]
+        self.truncated = [False] * len(tasks)
+        return np.array(self.pool.map(_evaluate_worker, tasks))
+
+
+    def close(self):
+        '''
+        stop the worker processes
+        '''
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+
+class BatchEvaluator:
+    '''
+    evaluate all the genomes as one vectorized rollout of a batch_sim.RobotBatch driven by a
+    PopulationController wrapping the genome matrix
+    '''
+    def __init__(self, robot, sizes, steps=FITNESS_STEPS, seed=None):
+        '''
+        the batch starts where the robot started and uses its wheel noise,
+        steps is the length of the rollouts, if a seed is given the noise generator of the
+        batch is reseeded with it before every rollout
+        '''
+        self.robot = robot
+        self.sizes = sizes
+        self.steps = steps
+        self.seed = seed
+        self.robot_batch = None
+        self.truncated = []
+
+
+    def __call__(self, genomes):
+        genomes = np.ascontiguousarray(genomes, dtype=np.float64)
+        if self.robot_batch is None or self.robot_batch.num_robots != len(genomes):
+            self.robot_batch = RobotBatch(self.robot.maze, self.robot.start_pos,
+                                          len(genomes), self.robot.wheel_noise)
+        if self.seed is not None:
+            self.robot_batch.rng = np.random.default_rng(self.seed)
+        controllers = PopulationController(len(genomes), *self.sizes, genomes=genomes)
+        self.truncated = [False] * len(genomes)
+        return fitness_batch(self.robot_batch, controllers, self.steps)
+
+
+    def close(self):
+        '''
+        nothing to release
+        '''
+
+
+def _controller(genome, sizes):
+    '''
+    controller of the given (input, hidden, output) sizes wrapping the genome
+    '''
+    return ANNController(*sizes, genome=np.ascontiguousarray(genome, dtype=np.float64))
+
+
+def seeded_fitness(robot, weights, sizes, seed, early_stopping=None, recorder=None,
+                   steps=FITNESS_STEPS):
+    '''
+    determine the fitness of the weights with a fresh controller of the given
+    (input, hidden, output) sizes and the random generators reseeded with seed,
+    the state of the generators is restored afterwards
+    '''
+    controller = _controller(weights, sizes)
+
+    random_state, numpy_state = random.getstate(), np.random.get_state()
+    random.seed(seed)
+    np.random.seed(seed)
+    try:
+        return fitness(robot, controller, steps, early_stopping, recorder)
+    finally:
+        random.setstate(random_state)
+        np.random.set_state(numpy_state)
+
+
+# robot of a worker process, copied once when the worker starts
+_worker_robot = None
+
+
+def _init_worker(robot):
+    '''
+    store the copy of the robot (and its maze) of the worker process
+    '''
+    global _worker_robot # pylint: disable=global-statement
+    _worker_robot = robot
+
+
+def _evaluate_worker(task):
+    '''
+    evaluate a flat weight array in a worker process
+    '''
+    weights, sizes, seed, steps = task
+    return seeded_fitness(_worker_robot, weights, sizes, seed, steps=steps)
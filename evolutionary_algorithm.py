@@ -4,17 +4,41 @@ this file contains the implementation of the evolutionary algorithm
 
 import numpy as np
 from ann import ANNController
-from fitness import fitness
+from fitness import FITNESS_STEPS
+from fitness_cache import FitnessCache, FITNESS_CACHE_SIZE
+import genetic_operators
+from evaluators import SerialEvaluator, PoolEvaluator, BatchEvaluator
 
 
 class EvolutionaryAlgorithm:
     '''
     evolutionary algorithm to evolve the population of controllers
     '''
-    def __init__(self, population_size, input_size, hidden_size, output_size,robot, mutation_rate=0.01, crossover_rate=0.7):
-        '''
-        initialize the evolutionary algorithm with the given parameters
-        '''
+    def __init__(self, population_size, input_size, hidden_size, output_size,robot, mutation_rate=0.01, crossover_rate=0.7,
+                 batch_evaluation=False, workers=None, seed=None, cache_size=FITNESS_CACHE_SIZE,
+                 crossover_method="single", rng=None, early_stopping=None, steps=FITNESS_STEPS):
+        '''
+        initialize the evolutionary algorithm with the given parameters,
+        with batch_evaluation the whole population is evaluated as one vectorized rollout,
+        with workers the individuals are evaluated in parallel by a pool of worker processes.
+        if a seed is given (always the case with workers) the random generators are reseeded
+        with it before every rollout, so every individual sees the same noise and the scores
+        do not depend on the order or the process in which they are computed.
+        the fitness of every distinct genome is cached per evaluation context (cache_size=0
+        disables it), only with a seed and without batch_evaluation: without a seed every rollout
+        is noisy and a cached score would freeze a single noisy sample, and in a batch the noise
+        of an individual depends on its place in the batch. a seeded batch is still reproducible
+        for the same population. steps is the length of the rollouts.
+        crossover_method is "single", "multi" or "uniform" (see genetic_operators), rng is the
+        numpy.random.Generator used by the parent selection and the genetic operators, by
+        default it is derived from the seed so a seeded run is reproducible.
+        early_stopping is an optional fitness.EarlyStopping policy for the serial rollouts, a
+        child is stopped as soon as it can no longer beat the least fit individual, it cannot be
+        combined with batch_evaluation or workers
+        '''
+        if early_stopping is not None and (batch_evaluation or workers is not None):
+            raise ValueError("early_stopping only applies to serial evaluation, "
+                             "not with batch_evaluation or workers")
         self.population_size = population_size
         self.input_size = input_size
         self.hidden_size = hidden_size
@@ -23,6 +47,27 @@ class EvolutionaryAlgorithm:
         self.mutation_rate = mutation_rate
         self.crossover_rate = crossover_rate
         self.population = [ANNController(input_size, hidden_size, output_size) for _ in range(population_size)]
+        self.batch_evaluation = batch_evaluation
+        self.workers = workers
+        if workers is not None and seed is None:
+            seed = int(np.random.randint(2**31))
+        self.seed = seed
+        self.steps = steps
+        cacheable = seed is not None and not batch_evaluation
+        self.fitness_cache = FitnessCache(cache_size) if cache_size and cacheable else None
+        self.crossover_method = crossover_method
+        self.rng = np.random.default_rng(seed) if rng is None else rng
+        self.early_stopping = early_stopping
+        self.truncated = []
+        # the evaluators.py evaluator running the rollouts
+        sizes = (input_size, hidden_size, output_size)
+        if batch_evaluation:
+            self.evaluator = BatchEvaluator(robot, sizes, steps, seed)
+        elif workers is not None:
+            self.evaluator = PoolEvaluator(robot, sizes, workers, seed, steps)
+        else:
+            self.evaluator = SerialEvaluator(robot, sizes, seed, early_stopping=early_stopping,
+                                             steps=steps)
     
 
     def evolve(self):
@@ -39,7 +84,7 @@ class EvolutionaryAlgorithm:
             # Create a child by crossover and mutation
             child = self.create_child(parent1, parent2)
             print("Child created")
-            child_fitness = fitness(self.robot, child)
+            child_fitness = self.evaluate_individual(child, threshold=np.min(fitness_scores))
             # Insert the child into the population if it is fitter than the least fit individual
             if self.insert_child_if_fitter(child, child_fitness, fitness_scores):
                 fitness_scores = self.evaluate_fitness()  # Re-evaluate fitness scores after insertion
@@ -49,9 +94,92 @@ class EvolutionaryAlgorithm:
  
     def evaluate_fitness(self):
         '''
-        evaluate the fitness of each individual in the population
+        evaluate the fitness of each individual in the population,
+        individuals already evaluated in the same context are served from the fitness cache
+        '''
+        return self.evaluate_population(self.population)
+
+
+    def evaluate_population(self, individuals):
+        '''
+        evaluate the fitness of the given individuals, simulating each distinct genome once
+        '''
+        if self.fitness_cache is None:
+            return self.simulate(individuals)
+
+        context = self.evaluation_context()
+        keys = [FitnessCache.key(individual.genome, context) for individual in individuals]
+        scores = [self.fitness_cache.get(key) for key in keys]
+
+        # simulate the distinct genomes that are not cached
+        missing = {}
+        for index, (key, score) in enumerate(zip(keys, scores)):
+            if score is None and key not in missing:
+                missing[key] = index
+        if missing:
+            new_scores = self.simulate([individuals[index] for index in missing.values()])
+            for key, score, truncated in zip(missing, new_scores, self.truncated):
+                # a rollout stopped early only gives a lower bound of the fitness
+                if not truncated:
+                    self.fitness_cache.put(key, score)
+            computed = dict(zip(missing, new_scores))
+            scores = [computed[key] if score is None else score for key, score in zip(keys, scores)]
+
+        return np.array(scores)
+
+
+    def simulate(self, individuals):
+        '''
+        run the rollouts of the individuals with the evaluator (serially, on the process pool
+        or as one batch), self.truncated tells which rollouts were stopped early
+        '''
+        if not individuals:
+            self.truncated = []
+            return np.array([])
+        # the seed and steps are part of the evaluation context and can change between generations
+        self.evaluator.steps = self.steps
+        self.evaluator.seed = self.seed
+        scores = self.evaluator(np.stack([individual.genome for individual in individuals]))
+        self.truncated = self.evaluator.truncated
+        return scores
+
+
+    def evaluate_individual(self, individual, threshold=None):
+        '''
+        evaluate the fitness of a single individual, using the fitness cache,
+        with early stopping the rollout stops once the individual can no longer reach threshold
+        '''
+        if self.early_stopping is None:
+            return self.evaluate_population([individual])[0]
+        self.early_stopping.threshold = threshold
+        try:
+            return self.evaluate_population([individual])[0]
+        finally:
+            self.early_stopping.threshold = None
+
+
+    def evaluation_context(self):
         '''
-        return np.array([fitness(self.robot,individual) for individual in self.population])
+        everything besides the genome that the fitness of an individual depends on
+        '''
+        robot = self.robot
+        return (robot.maze.fingerprint(), robot.start_pos, self.seed, self.steps,
+                robot.wheel_noise, robot.sensor_noise, robot.sensor_model, robot.collision_model,
+                self.batch_evaluation)
+
+
+    def best_individual(self):
+        '''
+        return the fittest individual of the population
+        '''
+        return self.population[int(np.argmax(self.evaluate_fitness()))]
+
+
+    def close(self):
+        '''
+        stop the worker processes
+        '''
+        self.evaluator.close()
     
 
     def rank_population(self, fitness_scores):
@@ -67,7 +195,7 @@ class EvolutionaryAlgorithm:
         select two parents based on fitness
         '''
         probabilities = fitness_scores / fitness_scores.sum()  
-        parents_indices = np.random.choice(len(self.population), 2, p=probabilities) #bigger fitness, bigger probability
+        parents_indices = self.rng.choice(len(self.population), 2, p=probabilities) #bigger fitness, bigger probability
         return self.population[parents_indices[0]], self.population[parents_indices[1]]
     
     
@@ -75,28 +203,25 @@ class EvolutionaryAlgorithm:
         '''
         create a child by crossover and mutation
         '''
-        child = ANNController(self.input_size, self.hidden_size, self.output_size)
-        # check if crossover happens
-        if np.random.rand() < self.crossover_rate:
-            weights1, weights2 = parent1.get_weights(), parent2.get_weights()
-            crossover_point = np.random.randint(0, len(weights1))
-            new_weights = np.concatenate((weights1[:crossover_point], weights2[crossover_point:]))
-            child.set_weights(new_weights)
-        else:
-            child.set_weights(parent1.get_weights())
-        return self.mutate(child)
-    
+        genomes = np.stack((parent1.genome, parent2.genome))
+        child = genetic_operators.make_children(genomes, [(0, 1)], self.crossover_rate,
+                                                self.mutation_rate, self.rng, self.crossover_method)
+        return self.wrap_genome(child[0])
+
+
+    def wrap_genome(self, genome):
+        '''
+        return a controller using the genome as its weights, without copying it
+        '''
+        return ANNController(self.input_size, self.hidden_size, self.output_size, genome=genome)
     
 
+
     def mutate(self, individual):
         '''
-        mutate the weights of the individual
+        mutate the weights of the individual in place
         '''
-        weights = individual.get_weights()
-        for i in range(len(weights)):
-            if np.random.rand() < self.mutation_rate:
-                weights[i] += np.random.randn() * 0.1
-        individual.set_weights(weights)
+        genetic_operators.mutate(individual.genome, self.mutation_rate, self.rng)
         return individual
     
     
@@ -2,17 +2,148 @@
 This file contains the fitness function to determine the fitness of the robot with the given 
 controller to make it move and return the explored area
 '''
+import math
+from functools import lru_cache
 import numpy as np
+from ann import PopulationController
+from forward_kin import batch_motion_without_collision
+from config.maze_config import CELL_SIZE
 
-def fitness(robot, ann_controller, steps=500):
+FITNESS_STEPS = 500
+STEP_DISTANCE_MARGIN = 1.05 # safety factor on the sampled maximum of the distance of one step
+
+
+@lru_cache(maxsize=32)
+def max_step_distance(max_wheel_speed, samples=101):
+    '''
+    largest distance the robot moves in one step with wheel speeds up to max_wheel_speed,
+    taken from the kinematics (forward_kin) over a grid of wheel speeds and headings rather
+    than assumed to be max_wheel_speed: the general case computes y from the already rotated
+    x and can move farther. the sampled maximum is scaled by STEP_DISTANCE_MARGIN
+    '''
+    speeds = np.linspace(-max_wheel_speed, max_wheel_speed, samples)
+    headings = np.linspace(0, 2 * np.pi, 72, endpoint=False)
+    v_l, v_r, theta = np.meshgrid(speeds, speeds, headings, indexing="ij")
+    zeros = np.zeros_like(theta)
+    x, y, _ = batch_motion_without_collision(np.stack([zeros, zeros, theta, v_l, v_r], axis=-1), 1)
+    return float(np.hypot(x, y).max()) * STEP_DISTANCE_MARGIN
+
+
+class EarlyStopping:
+    '''
+    policy to stop a rollout early when the robot stagnates (no new explored cell and almost no
+    movement for stagnation_steps steps) or when it can no longer reach the threshold (the
+    fitness of the current worst individual) in the remaining steps. a stopped rollout returns
+    the cells explored so far, rollouts that run to the end are not affected
+    '''
+    def __init__(self, threshold=None, stagnation_steps=100, stagnation_distance=CELL_SIZE / 2,
+                 check_interval=10, max_wheel_speed=1.0):
+        '''
+        max_wheel_speed bounds the wheel speeds given by the controller (1 for the sigmoid
+        outputs of ANNController), it is used for the upper bound on the reachable fitness
+        '''
+        self.threshold = threshold
+        self.stagnation_steps = stagnation_steps
+        self.stagnation_distance = stagnation_distance
+        self.check_interval = check_interval
+        self.max_wheel_speed = max_wheel_speed
+        self.last_stopped = False
+        self.rollouts = 0
+        self.stopped = 0
+        self.steps_saved = 0
+
+
+    def start(self, robot):
+        '''
+        start watching a new rollout of the robot
+        '''
+        self.last_stopped = False
+        self.rollouts += 1
+        self._explored = robot.calculate_explored_area()
+        self._anchor = (robot.x, robot.y)
+        self._anchor_step = 0
+
+
+    def should_stop(self, robot, step, steps):
+        '''
+        check after step steps of a rollout of the given length whether to stop it
+        '''
+        if step % self.check_interval or step >= steps:
+            return False
+        explored = robot.calculate_explored_area()
+
+        # stagnation: nothing new explored and no real movement since the anchor
+        moved = math.hypot(robot.x - self._anchor[0], robot.y - self._anchor[1])
+        if explored > self._explored or moved > self.stagnation_distance:
+            self._explored = explored
+            self._anchor = (robot.x, robot.y)
+            self._anchor_step = step
+        elif step - self._anchor_step >= self.stagnation_steps:
+            return self._stop(step, steps)
+
+        # upper bound: a path of length d crosses at most d / CELL_SIZE + 1 grid lines in each
+        # direction, every crossing can enter one new cell, and every step records one position
+        if self.threshold is not None:
+            remaining = steps - step
+            distance = remaining * max_step_distance(self.max_wheel_speed * (1 + robot.wheel_noise))
+            reachable = min(remaining, 2 * (int(distance // CELL_SIZE) + 1))
+            if explored + reachable < self.threshold:
+                return self._stop(step, steps)
+        return False
+
+
+    def _stop(self, step, steps):
+        '''
+        record a rollout stopped after step steps
+        '''
+        self.last_stopped = True
+        self.stopped += 1
+        self.steps_saved += steps - step
+        return True
+
+
+    def stats(self):
+        '''
+        return the number of rollouts, of stopped rollouts and of simulation steps saved
+        '''
+        return {"rollouts": self.rollouts, "stopped": self.stopped, "steps_saved": self.steps_saved}
+
+
+def fitness(robot, ann_controller, steps=FITNESS_STEPS, early_stopping=None, recorder=None):
     '''
-    determine the fitness of the robot with the given controller to make it move and return the explored area
+    determine the fitness of the robot with the given controller to make it move and return the explored area,
+    with an EarlyStopping policy the rollout can end before the given number of steps,
+    with a recorder.TrajectoryRecorder every step of the rollout is recorded
     '''
     robot.reset()
-    for _ in range(steps):
+    if early_stopping is not None:
+        early_stopping.start(robot)
+    if recorder is not None:
+        recorder.begin_rollout()
+    for step in range(steps):
         sensors = robot.sensors
         inputs = np.array(sensors).flatten()
         vl, vr = ann_controller.forward(inputs)
         robot.move_with_diff_drive(vl, vr)
         robot.update_sensors()
-    return robot.calculate_explored_area()
\ No newline at end of file
+        if recorder is not None:
+            recorder.record(robot, vl, vr)
+        if early_stopping is not None and early_stopping.should_stop(robot, step + 1, steps):
+            break
+    return robot.calculate_explored_area()
+
+
+def fitness_batch(robots, ann_controllers, steps=FITNESS_STEPS):
+    '''
+    determine the fitness of several controllers at once, robots is a batch_sim.RobotBatch with
+    one robot per controller, all the robots are stepped in lockstep and all the controllers
+    run as one ann.PopulationController (a PopulationController can also be passed directly)
+    '''
+    if not isinstance(ann_controllers, PopulationController):
+        ann_controllers = PopulationController.from_controllers(ann_controllers)
+    robots.reset()
+    for _ in range(steps):
+        outputs = ann_controllers.forward(robots.sensors)
+        robots.move_with_diff_drive(outputs[:, 0], outputs[:, 1])
+        robots.update_sensors()
+    return robots.calculate_explored_area()
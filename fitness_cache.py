@@ -0,0 +1,68 @@
+'''
+This file contains a bounded cache of fitness scores keyed by the genome and the evaluation
+context, so an unchanged individual is not simulated again
+'''
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+FITNESS_CACHE_SIZE = 1024
+
+
+class FitnessCache:
+    '''
+    least recently used cache of fitness scores with hit and miss statistics
+    '''
+    def __init__(self, max_size=FITNESS_CACHE_SIZE):
+        '''
+        initialize an empty cache holding at most max_size scores
+        '''
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._scores = OrderedDict()
+
+
+    @staticmethod
+    def key(weights, context):
+        '''
+        hash of the weight vector and the evaluation context (a tuple of plain values)
+        '''
+        digest = hashlib.sha1(np.ascontiguousarray(weights, dtype=np.float64).tobytes())
+        digest.update(repr(context).encode())
+        return digest.digest()
+
+
+    def get(self, key):
+        '''
+        return the cached score for the key, or None on a miss
+        '''
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._scores.move_to_end(key)
+        return score
+
+
+    def put(self, key, score):
+        '''
+        store the score for the key, evicting the least recently used score when full
+        '''
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        if len(self._scores) > self.max_size:
+            self._scores.popitem(last=False)
+
+
+    def __len__(self):
+        return len(self._scores)
+
+
+    def stats(self):
+        '''
+        return the hit and miss counters and the number of cached scores
+        '''
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._scores)}
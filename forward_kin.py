@@ -1,11 +1,14 @@
 """Forward kinematics for the robot"""
-import numpy as np
+from typing import TYPE_CHECKING
 
-import pygame
+import numpy as np
 
 from config.robot_config import ROBOT_RADIUS
 from collision_config import NORTH, SOUTH, EAST, WEST, CENTER
 
+if TYPE_CHECKING:
+    import pygame
+
 
 L = ROBOT_RADIUS # distance between wheels
 col_dict = {
@@ -15,6 +18,8 @@ col_dict = {
     WEST: "WEST"
 }
 
+CARDINALS = ("NORTH", "SOUTH", "EAST", "WEST")
+
 def motion_without_collison(state, d_t):
     """state change not accounting for collisions"""
 
@@ -55,14 +60,67 @@ def motion_without_collison(state, d_t):
     # new x, y, and theta
     return (x, y, theta)
 
-def motion_with_collision(state, d_t, rectangle_list, mask: pygame.mask.Mask):
-    """state change accounting for collisions,"""
+def batch_motion_without_collision(states, d_t):
+    """state change not accounting for collisions, for an array of states.
+       states has shape (..., 5) with the columns x, y, theta, v_l, v_r and d_t is a scalar or
+       broadcastable against states[..., 0]. the straight line, rotation in place and general
+       cases are selected with masks, the result matches motion_without_collison element-wise.
+       returns the arrays (x, y, theta)"""
+    states = np.asarray(states, dtype=float)
+    x, y, theta = states[..., 0], states[..., 1], states[..., 2]
+    v_l, v_r = states[..., 3], states[..., 4]
+
+    # masks for the three cases of motion_without_collison
+    straight = v_l == v_r
+    spin = ~straight & (v_l == -v_r)
+    general = ~straight & ~spin
+
+    # intermediate variables, the radius is only defined in the general case
+    omega = (v_r - v_l) / L
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = np.where(general, L / 2 * (v_l + v_r) / (v_r - v_l), 0.0)
+    icc_x = x - r * np.sin(theta)
+    icc_y = y + r * np.cos(theta)
+    cos_w, sin_w = np.cos(omega * d_t), np.sin(omega * d_t)
+
+    # general case, y is computed from the rotated x like in motion_without_collison
+    general_x = (x - icc_x) * cos_w - (y - icc_y) * sin_w + icc_x
+    general_y = (general_x - icc_x) * sin_w + (y - icc_y) * cos_w + icc_y
+
+    new_x = np.where(straight, x + v_l * np.cos(theta) * d_t, np.where(general, general_x, x))
+    new_y = np.where(straight, y + v_l * np.sin(theta) * d_t, np.where(general, general_y, y))
+
+    # theta wrap around
+    new_theta = np.where(straight, theta, theta + omega * d_t) % (2 * np.pi)
+    return (new_x, new_y, new_theta)
+
+def motion_with_collision(state, d_t, rectangle_list, mask: "pygame.mask.Mask", wall_index=None):
+    """state change accounting for collisions,
+       if a wall_index is given only the walls around the robot are tested"""
 
     # detect collison with the maze walls
-    collision_list = collision_type(state, rectangle_list, mask)
+    collision_list = collision_type(state, rectangle_list, mask, wall_index)
 
     # movement without collision
-    (x, y, theta) = motion_without_collison(state, d_t)
+    new_state = motion_without_collison(state, d_t)
+
+    return resolve_collisions(state, new_state, collision_list)
+
+def motion_with_grid_collision(state, d_t, occupancy, cell_size, radius=ROBOT_RADIUS):
+    """state change accounting for collisions, using the analytic circle vs grid test
+       instead of the pygame masks, no calibration needed"""
+
+    # detect collison with the maze walls
+    collision_list = collision_type_grid(state, occupancy, cell_size, radius)
+
+    # movement without collision
+    new_state = motion_without_collison(state, d_t)
+
+    return resolve_collisions(state, new_state, collision_list)
+
+def resolve_collisions(state, new_state, collision_list):
+    """block the movement of new_state in the directions of the collisions"""
+    (x, y, theta) = new_state
 
     # handle collision
     for collision in collision_list:
@@ -79,16 +137,21 @@ def motion_with_collision(state, d_t, rectangle_list, mask: pygame.mask.Mask):
 
     return (x, y, theta)
 
-def collision_type(state, rectangle_list, robot_mask: pygame.mask.Mask):
-    """detect the type of collision with the maze walls"""
+def collision_type(state, rectangle_list, robot_mask: "pygame.mask.Mask", wall_index=None):
+    """detect the type of collision with the maze walls,
+       the wall_index (spatial_index.WallIndex) narrows the walls down to the robot's neighbourhood"""
+    # the masks need pygame, which is kept out of the import of the simulation core
+    from mask_cache import MASK_CACHE # pylint: disable=import-outside-toplevel
+
+    if wall_index is not None:
+        # one pixel of margin for the truncation of the mask offsets
+        rectangle_list = wall_index.query(state[0], state[1], ROBOT_RADIUS + 1)
 
     collison_list = []
     # check for collision with the maze walls
     for rect in rectangle_list:
-        # create a mask for the rectangle
-        temp_surface = pygame.Surface((rect.width, rect.height))
-        temp_surface.fill((255, 255, 255))  # Fill white (color does not matter)
-        rect_mask = pygame.mask.from_surface(temp_surface)
+        # get the prebuilt mask for the rectangle
+        rect_mask = MASK_CACHE.wall_mask(rect.width, rect.height)
 
         # get the position of the rectangle
         rect_pos = (rect.x, rect.y)
@@ -113,6 +176,83 @@ def collision_type(state, rectangle_list, robot_mask: pygame.mask.Mask):
 
     return collison_list
 
+def grid_collision_flags(x, y, occupancy, cell_size, radius=ROBOT_RADIUS):
+    """closed form circle vs axis aligned cell test against the occupancy grid,
+       x and y can be arrays of robot positions.
+       returns a boolean array (..., 4) with the blocked directions in the order of CARDINALS"""
+    x = np.asarray(x, dtype=float)[..., None]
+    y = np.asarray(y, dtype=float)[..., None]
+    rows, cols = occupancy.shape
+
+    # the cells that can touch the circle
+    reach = int(np.ceil(radius / cell_size))
+    offsets = np.arange(-reach, reach + 1)
+    offset_x, offset_y = (o.ravel() for o in np.meshgrid(offsets, offsets))
+    cell_x = np.floor(x / cell_size).astype(int) + offset_x
+    cell_y = np.floor(y / cell_size).astype(int) + offset_y
+
+    # cells outside of the grid are walls
+    wall = (cell_x < 0) | (cell_y < 0) | (cell_x >= cols) | (cell_y >= rows)
+    inside = ~wall
+    wall[inside] = occupancy[cell_y[inside], cell_x[inside]]
+
+    # vector from the center of the robot to the closest point of every cell
+    to_x = np.clip(x, cell_x * cell_size, (cell_x + 1) * cell_size) - x
+    to_y = np.clip(y, cell_y * cell_size, (cell_y + 1) * cell_size) - y
+    touching = wall & (to_x ** 2 + to_y ** 2 < radius ** 2)
+
+    # a center inside a wall has no closest point, use the direction of the cell center
+    buried = (to_x == 0) & (to_y == 0)
+    to_x = np.where(buried, (cell_x + 0.5) * cell_size - x, to_x)
+    to_y = np.where(buried, (cell_y + 0.5) * cell_size - y, to_y)
+
+    # snap the contact to the dominant axis
+    horizontal = np.abs(to_x) >= np.abs(to_y)
+    flags = np.stack([
+        touching & ~horizontal & (to_y < 0),  # NORTH
+        touching & ~horizontal & (to_y > 0),  # SOUTH
+        touching & horizontal & (to_x > 0),   # EAST
+        touching & horizontal & (to_x < 0),   # WEST
+    ], axis=-1)
+    return flags.any(axis=-2)
+
+def collision_type_grid(state, occupancy, cell_size, radius=ROBOT_RADIUS):
+    """detect the type of collision with the maze walls, analytic version of collision_type.
+       scalar version of grid_collision_flags, a python loop is faster than numpy for 9 cells"""
+    x, y = float(state[0]), float(state[1])
+    rows, cols = occupancy.shape
+    reach = int(np.ceil(radius / cell_size))
+    center_x, center_y = int(x // cell_size), int(y // cell_size)
+
+    flags = [False] * len(CARDINALS)
+    for cell_y in range(center_y - reach, center_y + reach + 1):
+        for cell_x in range(center_x - reach, center_x + reach + 1):
+            # cells outside of the grid are walls
+            if 0 <= cell_x < cols and 0 <= cell_y < rows and not occupancy[cell_y, cell_x]:
+                continue
+
+            # vector from the center of the robot to the closest point of the cell
+            to_x = min(max(x, cell_x * cell_size), (cell_x + 1) * cell_size) - x
+            to_y = min(max(y, cell_y * cell_size), (cell_y + 1) * cell_size) - y
+            if to_x ** 2 + to_y ** 2 >= radius ** 2:
+                continue
+
+            # a center inside a wall has no closest point, use the direction of the cell center
+            if to_x == 0 and to_y == 0:
+                to_x = (cell_x + 0.5) * cell_size - x
+                to_y = (cell_y + 0.5) * cell_size - y
+
+            # snap the contact to the dominant axis
+            if abs(to_x) >= abs(to_y):
+                if to_x > 0:
+                    flags[2] = True
+                elif to_x < 0:
+                    flags[3] = True
+            else:
+                flags[1 if to_y > 0 else 0] = True
+
+    return [direction for direction, flag in zip(CARDINALS, flags) if flag]
+
 def wall_angle(sensors):
     """Calculate the angle of the  wall, relative to the shortest sensor reading.
        to simplify the syntax we will work directly with the maths:
@@ -0,0 +1,140 @@
+'''
+This file contains a generational evolutionary algorithm that holds the population as a
+(population_size, n_weights) genome matrix with a fitness vector. Every generation keeps the
+elites, breeds all the other individuals at once with vectorized selection and genetic
+operators and evaluates only the children, so the cost of a generation is fixed
+'''
+import numpy as np
+from ann import ANNController
+import genetic_operators
+
+SELECTION_METHODS = ("roulette", "tournament", "rank")
+
+
+def select(fitness_scores, num_parents, method, rng, tournament_size=3):
+    '''
+    draw num_parents indices of the population, fitter individuals more often:
+    roulette (proportional to fitness), tournament (fittest of tournament_size random
+    individuals) or rank (proportional to the rank of the fitness)
+    '''
+    if method not in SELECTION_METHODS:
+        raise ValueError(f"unknown selection method {method!r}, expected one of {SELECTION_METHODS}")
+    population_size = len(fitness_scores)
+
+    if method == "tournament":
+        contenders = rng.integers(0, population_size, size=(num_parents, tournament_size))
+        winners = np.argmax(fitness_scores[contenders], axis=1)
+        return contenders[np.arange(num_parents), winners]
+
+    if method == "rank":
+        weights = np.argsort(np.argsort(fitness_scores)) + 1.0
+    else:
+        weights = np.maximum(fitness_scores, 0).astype(float)
+        if weights.sum() == 0:
+            weights = np.ones(population_size)
+    return rng.choice(population_size, size=num_parents, p=weights / weights.sum())
+
+
+class GenerationalEA:
+    '''
+    generational evolutionary algorithm on a genome matrix with a pluggable evaluator
+    (evaluators.SerialEvaluator, PoolEvaluator or BatchEvaluator, or any callable mapping a
+    genome matrix to a fitness vector)
+    '''
+    def __init__(self, population_size, input_size, hidden_size, output_size, evaluator,
+                 mutation_rate=0.01, crossover_rate=0.7, crossover_method="single",
+                 selection="tournament", tournament_size=3, elitism=2, rng=None):
+        '''
+        initialize a random population, the elitism fittest individuals are carried over to the
+        next generation unchanged and are not evaluated again, so the evaluator should be
+        deterministic (seeded) for their scores to stay meaningful
+        '''
+        if not 0 <= elitism < population_size:
+            raise ValueError("elitism must be smaller than the population size")
+        self.population_size = population_size
+        self.input_size = input_size
+        self.hidden_size = hidden_size
+        self.output_size = output_size
+        self.evaluator = evaluator
+        self.mutation_rate = mutation_rate
+        self.crossover_rate = crossover_rate
+        self.crossover_method = crossover_method
+        self.selection = selection
+        self.tournament_size = tournament_size
+        self.elitism = elitism
+        self.rng = np.random.default_rng() if rng is None else rng
+
+        num_weights = hidden_size * (input_size + hidden_size + output_size)
+        self.genomes = self.rng.standard_normal((population_size, num_weights))
+        self.fitness = None
+        self.generation = 0
+
+
+    def evaluate(self):
+        '''
+        evaluate the whole population
+        '''
+        self.fitness = np.asarray(self.evaluator(self.genomes), dtype=float)
+        return self.fitness
+
+
+    def step(self):
+        '''
+        replace the population by the elites and a new generation of children,
+        return the best fitness of the new population
+        '''
+        if self.fitness is None:
+            self.evaluate()
+
+        num_children = self.population_size - self.elitism
+        parents = select(self.fitness, 2 * num_children, self.selection, self.rng,
+                         self.tournament_size).reshape(num_children, 2)
+        children = genetic_operators.make_children(self.genomes, parents, self.crossover_rate,
+                                                   self.mutation_rate, self.rng,
+                                                   self.crossover_method)
+        child_fitness = np.asarray(self.evaluator(children), dtype=float)
+
+        elites = np.argsort(self.fitness)[::-1][:self.elitism]
+        # the fancy indexing copies the elites before their rows are overwritten
+        self.genomes[:self.elitism] = self.genomes[elites]
+        self.fitness[:self.elitism] = self.fitness[elites]
+        self.genomes[self.elitism:] = children
+        self.fitness[self.elitism:] = child_fitness
+        self.generation += 1
+        return self.fitness.max()
+
+
+    def run(self, generations):
+        '''
+        evolve the population for the given number of generations,
+        return the best fitness of every generation
+        '''
+        return [self.step() for _ in range(generations)]
+
+
+    def best_individual(self):
+        '''
+        return the fittest individual as a controller with a copy of its genome
+        '''
+        if self.fitness is None:
+            self.evaluate()
+        genome = self.genomes[int(np.argmax(self.fitness))].copy()
+        return ANNController(self.input_size, self.hidden_size, self.output_size, genome=genome)
+
+
+    def population(self):
+        '''
+        return the individuals as controllers wrapping the rows of the genome matrix
+        (they change when the population evolves)
+        '''
+        return [ANNController(self.input_size, self.hidden_size, self.output_size, genome=genome)
+                for genome in self.genomes]
+
+
+    def close(self):
+        '''
+        release the resources of the evaluator
+        '''
+        close = getattr(self.evaluator, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,73 @@
+'''
+This file contains the genetic operators of the evolutionary algorithm written as whole-array
+operations on genomes (rows of a (N, n_weights) matrix), so an entire generation of children
+is created with a few numpy calls instead of a python loop over every weight
+'''
+import numpy as np
+
+MUTATION_SCALE = 0.1
+CROSSOVER_METHODS = ("single", "multi", "uniform")
+
+
+def mutate(genomes, mutation_rate, rng, scale=MUTATION_SCALE):
+    '''
+    mutate the genomes in place, every weight is perturbed with probability mutation_rate by
+    gaussian noise with standard deviation scale
+    '''
+    mask = rng.random(genomes.shape) < mutation_rate
+    genomes[mask] += rng.standard_normal(np.count_nonzero(mask)) * scale
+    return genomes
+
+
+def point_crossover_mask(num_children, num_genes, num_points, rng):
+    '''
+    boolean (num_children, num_genes) mask, True where a child takes the gene of its first
+    parent, the parents alternate at num_points random cut points per child
+    '''
+    points = np.sort(rng.integers(0, num_genes, size=(num_children, num_points)), axis=1)
+    # number of cut points at or before every gene, even counts take the first parent
+    cuts = (np.arange(num_genes)[None, :, None] >= points[:, None, :]).sum(axis=2)
+    return cuts % 2 == 0
+
+
+def uniform_crossover_mask(num_children, num_genes, rng, probability=0.5):
+    '''
+    boolean (num_children, num_genes) mask, every gene is taken from the first parent with the
+    given probability
+    '''
+    return rng.random((num_children, num_genes)) < probability
+
+
+def crossover(parents1, parents2, mask, out=None):
+    '''
+    combine the genomes of the parents gene by gene, taking parents1 where the mask is True
+    '''
+    if out is None:
+        out = np.empty(np.broadcast_shapes(parents1.shape, parents2.shape, mask.shape))
+    np.copyto(out, parents2)
+    np.copyto(out, parents1, where=mask)
+    return out
+
+
+def make_children(genomes, parent_indices, crossover_rate, mutation_rate, rng,
+                  method="single", num_points=2, scale=MUTATION_SCALE):
+    '''
+    create one child per row of parent_indices (pairs of rows of genomes) by crossover, which
+    happens with probability crossover_rate (otherwise the child copies its first parent),
+    and mutation. method is "single", "multi" (num_points cut points) or "uniform"
+    :return: (num_children, n_weights) matrix of the child genomes
+    '''
+    if method not in CROSSOVER_METHODS:
+        raise ValueError(f"unknown crossover method {method!r}, expected one of {CROSSOVER_METHODS}")
+    parent_indices = np.asarray(parent_indices)
+    num_children, num_genes = len(parent_indices), genomes.shape[1]
+
+    if method == "uniform":
+        mask = uniform_crossover_mask(num_children, num_genes, rng)
+    else:
+        mask = point_crossover_mask(num_children, num_genes, 1 if method == "single" else num_points, rng)
+    # children without crossover take every gene from the first parent
+    mask[rng.random(num_children) >= crossover_rate] = True
+
+    children = crossover(genomes[parent_indices[:, 0]], genomes[parent_indices[:, 1]], mask)
+    return mutate(children, mutation_rate, rng, scale)
@@ -0,0 +1,66 @@
+"""
+geometry.py: Lightweight geometry used by the simulation core instead of pygame.Rect.
+"""
+
+from typing import NamedTuple
+
+
+class Rect(NamedTuple):
+    """
+    Axis aligned rectangle covering the pixels x .. x + width - 1 and y .. y + height - 1.
+    It is a 4-tuple, so pygame drawing functions accept it as a rectangle.
+    """
+    x: int
+    y: int
+    width: int
+    height: int
+
+    @property
+    def left(self):
+        """x-coordinate of the left edge."""
+        return self.x
+
+    @property
+    def top(self):
+        """y-coordinate of the top edge."""
+        return self.y
+
+    @property
+    def right(self):
+        """x-coordinate just right of the rectangle, like pygame.Rect.right."""
+        return self.x + self.width
+
+    @property
+    def bottom(self):
+        """y-coordinate just below the rectangle, like pygame.Rect.bottom."""
+        return self.y + self.height
+
+    def clipline(self, start, end):
+        """
+        Clip the line segment from start to end to the rectangle (Liang-Barsky),
+        with the same convention as pygame.Rect.clipline: the last pixel row and column are
+        x + width - 1 and y + height - 1. pygame clips on whole pixels, so lines grazing a
+        corner can differ by a pixel.
+        :return: The clipped segment ((x1, y1), (x2, y2)), or an empty tuple if the
+                 segment misses the rectangle.
+        """
+        (x1, y1), (x2, y2) = start, end
+        dx, dy = x2 - x1, y2 - y1
+        t_start, t_end = 0.0, 1.0
+
+        for p, q in ((-dx, x1 - self.x), (dx, self.x + self.width - 1 - x1),
+                     (-dy, y1 - self.y), (dy, self.y + self.height - 1 - y1)):
+            if p == 0:
+                # parallel to this edge and outside of it
+                if q < 0:
+                    return ()
+                continue
+            t = q / p
+            if p < 0:
+                t_start = max(t_start, t)
+            else:
+                t_end = min(t_end, t)
+            if t_start > t_end:
+                return ()
+
+        return ((x1 + t_start * dx, y1 + t_start * dy), (x1 + t_end * dx, y1 + t_end * dy))
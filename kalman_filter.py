@@ -4,6 +4,14 @@ kalman_filter.py: Class to calculate the Kalman filter.
 
 import numpy as np
 
+
+def wrap_angle(angle):
+    """
+    Wrap angles to [-pi, pi).
+    """
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+
 class KalmanFilter:
     """
     Kalman Filter with initializations.
@@ -61,6 +69,8 @@ class KalmanFilter:
             ), np.linalg.inv(state))
         
         y = measurement_vector - self.h(self.state_estimate, landmarks)
+        # bearings that differ by a full turn are the same measurement
+        y[0::2] = wrap_angle(y[0::2])
 
         # State update
         self.state_estimate = self.state_estimate + np.dot(kalman_gain, y)
@@ -71,6 +81,42 @@ class KalmanFilter:
                                         self.error_covariance)
 
 
+    def correct_visible(self, measurement_vector, landmarks, visible):
+        """
+        Correction step using only the visible landmarks, so the cost scales with the number of
+        visible landmarks instead of all of them. The innovation covariance is solved instead
+        of inverted and the covariance uses the Joseph form, which stays symmetric positive
+        definite with very small measurement noise.
+        :param measurement_vector: [bearing, distance] of every visible landmark, in order
+        :param landmarks: Positions of all the landmarks
+        :param visible: Boolean array, True for the visible landmarks
+        """
+        indices = np.flatnonzero(visible)
+        if len(indices) == 0:
+            return
+        landmarks = np.asarray(landmarks, dtype=float).reshape(-1, 2)[indices]
+        # rows of the visible landmarks in the full measurement vector
+        rows = np.stack([2 * indices, 2 * indices + 1], axis=1).ravel()
+        noise_covariance_measurement = self.noise_covariance_measurement[np.ix_(rows, rows)]
+
+        observation_matrix = self.jacobian_c(self.state_estimate, landmarks)
+        covariance_observation = np.dot(self.error_covariance, observation_matrix.T)
+        innovation_covariance = np.dot(observation_matrix, covariance_observation) \
+            + noise_covariance_measurement
+        # K = P H^T S^-1, solved as S K^T = H P (S and P are symmetric)
+        kalman_gain = np.linalg.solve(innovation_covariance, covariance_observation.T).T
+
+        y = np.asarray(measurement_vector, dtype=float) - self.h(self.state_estimate, landmarks)
+        y[0::2] = wrap_angle(y[0::2])
+        self.state_estimate = self.state_estimate + np.dot(kalman_gain, y)
+
+        # Joseph form: (I - K H) P (I - K H)^T + K R K^T
+        identity_matrix = np.eye(len(self.state_estimate))
+        update = identity_matrix - np.dot(kalman_gain, observation_matrix)
+        self.error_covariance = np.dot(np.dot(update, self.error_covariance), update.T) \
+            + np.dot(np.dot(kalman_gain, noise_covariance_measurement), kalman_gain.T)
+
+
     def calculate_bearing_and_distance(self, x, y, landmark_pos):
         """
         Observation function to calculate the bearing and distance to a landmark
@@ -87,28 +133,169 @@ class KalmanFilter:
         Define the measurement function h(x) for the Kalman Filter
         state_vector: state vector with 3 dimensionalities: [x, y, theta]
         landmarks: list of landmark positions [(x_l1, y_l1), (x_l2, y_l2), ...]
+        :return: [bearing_1, distance_1, bearing_2, ...], bearings wrapped to [-pi, pi)
         """
-        measurements = []
-        for (x_l, y_l) in landmarks:
-            dx = x_l - state_vector[0]
-            dy = y_l - state_vector[1]
-            d = np.sqrt(dx**2 + dy**2)
-            bearing = np.arctan2(dy, dx) - state_vector[2]
-            measurements.extend([bearing, d])
-        return np.array(measurements)
+        landmarks = np.asarray(landmarks, dtype=float).reshape(-1, 2)
+        dx = landmarks[:, 0] - state_vector[0]
+        dy = landmarks[:, 1] - state_vector[1]
+        measurements = np.empty(2 * len(landmarks))
+        measurements[0::2] = wrap_angle(np.arctan2(dy, dx) - state_vector[2])
+        measurements[1::2] = np.sqrt(dx**2 + dy**2)
+        return measurements
 
 
     def jacobian_c(self, state_vector, landmarks):
+        """
+        Calculate the Jacobian of the measurement function h(x) in closed form:
+        for a landmark at (dx, dy) from the robot and q = dx^2 + dy^2,
+        d bearing / d(x, y, theta) = (dy / q, -dx / q, -1)
+        d distance / d(x, y, theta) = (-dx / sqrt(q), -dy / sqrt(q), 0)
+        """
+        landmarks = np.asarray(landmarks, dtype=float).reshape(-1, 2)
+        dx = landmarks[:, 0] - state_vector[0]
+        dy = landmarks[:, 1] - state_vector[1]
+        # a landmark exactly under the robot has no defined bearing, avoid dividing by zero
+        q = np.maximum(dx**2 + dy**2, 1e-12)
+        d = np.sqrt(q)
+        jac = np.zeros((2 * len(landmarks), 3))
+        jac[0::2, 0] = dy / q
+        jac[0::2, 1] = -dx / q
+        jac[0::2, 2] = -1
+        jac[1::2, 0] = -dx / d
+        jac[1::2, 1] = -dy / d
+        return jac
+
+
+    def jacobian_c_numerical(self, state_vector, landmarks, epsilon=1e-5):
         """
         Calculate the Jacobian of the measurement function h(x),
-        the Numerical approximation of the Jacobian
+        the Numerical approximation of the Jacobian (reference for jacobian_c)
         """
-        epsilon = 1e-5
         jac = np.zeros((2 * len(landmarks), len(state_vector)))
         h_x = self.h(state_vector, landmarks)
         for i in range(len(state_vector)):
-            x_eps = np.copy(state_vector)
+            x_eps = np.array(state_vector, dtype=float)
             x_eps[i] += epsilon
-            h_x_eps = self.h(x_eps, landmarks)
-            jac[:, i] = (h_x_eps - h_x) / epsilon
+            difference = self.h(x_eps, landmarks) - h_x
+            difference[0::2] = wrap_angle(difference[0::2])
+            jac[:, i] = difference / epsilon
+        return jac
+
+
+class KalmanFilterBank:
+    """
+    N Kalman filters with the same model stored as stacked arrays: N state estimates and N 3x3
+    error covariances, predicted and corrected with batched matrix products and solves.
+    Used to localize many robots, or one robot under several noise settings, in one call.
+    """
+    def __init__(self, state_transition_matrix, control_input_matrix, noise_covariance,
+                 noise_covariance_measurement, state_estimates, error_covariances):
+        """
+        Initialize the filter bank, every matrix is either shared by all the filters or stacked
+        with one matrix per filter along a leading axis of length N
+        :param state_transition_matrix: Transition matrix, (3, 3) or (N, 3, 3)
+        :param control_input_matrix: Control-input matrix, (3, m) or (N, 3, m)
+        :param noise_covariance: Process noise covariance, (3, 3) or (N, 3, 3)
+        :param noise_covariance_measurement: Measurement noise covariance, (2L, 2L) or (N, 2L, 2L)
+        :param state_estimates: Initial state estimates, (N, 3)
+        :param error_covariances: Initial error covariances, (3, 3) or (N, 3, 3)
+        """
+        self.state_estimates = np.array(state_estimates, dtype=float)
+        num_filters, state_size = self.state_estimates.shape
+        self.state_transition_matrix = np.asarray(state_transition_matrix, dtype=float)  # A
+        self.control_input_matrix = np.asarray(control_input_matrix, dtype=float)  # B
+        self.noise_covariance = np.asarray(noise_covariance, dtype=float)  # Q
+        measurement_size = np.shape(noise_covariance_measurement)[-1]
+        self.noise_covariance_measurement = np.array(np.broadcast_to(  # R, writable per filter
+            noise_covariance_measurement, (num_filters, measurement_size, measurement_size)))
+        self.error_covariances = np.array(np.broadcast_to(  # P
+            error_covariances, (num_filters, state_size, state_size)), dtype=float)
+
+
+    def __len__(self):
+        return len(self.state_estimates)
+
+
+    def predict(self, control_vectors):
+        """
+        Prediction step of all the filters
+        :param control_vectors: The control inputs, (N, m)
+        """
+        transition = self.state_transition_matrix
+        self.state_estimates = np.matmul(transition, self.state_estimates[..., None])[..., 0] \
+            + np.matmul(self.control_input_matrix, np.asarray(control_vectors, dtype=float)[..., None])[..., 0]
+        self.error_covariances = np.matmul(np.matmul(transition, self.error_covariances),
+                                           np.swapaxes(transition, -1, -2)) + self.noise_covariance
+
+
+    def h(self, state_vectors, landmarks):
+        """
+        Measurement function of all the filters, (N, 2L) of [bearing, distance] per landmark
+        """
+        landmarks = np.asarray(landmarks, dtype=float).reshape(-1, 2)
+        dx = landmarks[None, :, 0] - state_vectors[:, None, 0]
+        dy = landmarks[None, :, 1] - state_vectors[:, None, 1]
+        measurements = np.empty((len(state_vectors), 2 * len(landmarks)))
+        measurements[:, 0::2] = wrap_angle(np.arctan2(dy, dx) - state_vectors[:, None, 2])
+        measurements[:, 1::2] = np.sqrt(dx**2 + dy**2)
+        return measurements
+
+
+    def jacobian_c(self, state_vectors, landmarks):
+        """
+        Jacobians of the measurement function of all the filters, (N, 2L, 3),
+        in closed form like KalmanFilter.jacobian_c
+        """
+        landmarks = np.asarray(landmarks, dtype=float).reshape(-1, 2)
+        dx = landmarks[None, :, 0] - state_vectors[:, None, 0]
+        dy = landmarks[None, :, 1] - state_vectors[:, None, 1]
+        q = np.maximum(dx**2 + dy**2, 1e-12)
+        d = np.sqrt(q)
+        jac = np.zeros((len(state_vectors), 2 * len(landmarks), 3))
+        jac[:, 0::2, 0] = dy / q
+        jac[:, 0::2, 1] = -dx / q
+        jac[:, 0::2, 2] = -1
+        jac[:, 1::2, 0] = -dx / d
+        jac[:, 1::2, 1] = -dy / d
         return jac
+
+
+    def correct(self, measurement_vectors, landmarks, visible=None):
+        """
+        Correction step of all the filters with batched solves and the Joseph form update.
+        With visible, the landmarks that are not visible to a filter are left out of its
+        correction: their Jacobian rows and innovations are zeroed and their noise block set
+        to the identity, which decouples them exactly (same result as KalmanFilter.correct_visible).
+        :param measurement_vectors: The measurements, (N, 2L), entries of hidden landmarks are ignored
+        :param landmarks: Positions of the L landmarks
+        :param visible: Optional boolean array (N, L), True for the landmarks each filter sees
+        """
+        observation_matrices = self.jacobian_c(self.state_estimates, landmarks)
+        y = np.asarray(measurement_vectors, dtype=float) - self.h(self.state_estimates, landmarks)
+        y[:, 0::2] = wrap_angle(y[:, 0::2])
+        noise_covariance_measurement = self.noise_covariance_measurement
+
+        if visible is not None:
+            used = np.repeat(np.asarray(visible, dtype=bool), 2, axis=1)
+            observation_matrices[~used] = 0
+            y[~used] = 0
+            noise_covariance_measurement = noise_covariance_measurement * (used[:, :, None] & used[:, None, :])
+            hidden_rows = np.nonzero(~used)
+            noise_covariance_measurement[hidden_rows[0], hidden_rows[1], hidden_rows[1]] = 1
+
+        covariance_observation = np.matmul(self.error_covariances,
+                                           np.swapaxes(observation_matrices, -1, -2))
+        innovation_covariances = np.matmul(observation_matrices, covariance_observation) \
+            + noise_covariance_measurement
+        # K = P H^T S^-1, solved as S K^T = H P
+        kalman_gains = np.swapaxes(np.linalg.solve(innovation_covariances,
+                                                   np.swapaxes(covariance_observation, -1, -2)), -1, -2)
+
+        self.state_estimates = self.state_estimates + np.matmul(kalman_gains, y[..., None])[..., 0]
+
+        # Joseph form: (I - K H) P (I - K H)^T + K R K^T
+        update = np.eye(self.state_estimates.shape[1]) - np.matmul(kalman_gains, observation_matrices)
+        self.error_covariances = np.matmul(np.matmul(update, self.error_covariances),
+                                           np.swapaxes(update, -1, -2)) \
+            + np.matmul(np.matmul(kalman_gains, noise_covariance_measurement),
+                        np.swapaxes(kalman_gains, -1, -2))
@@ -0,0 +1,71 @@
+"""
+landmark_visibility.py: Precomputed line of sight from every position of a maze to its landmarks.
+"""
+
+import numpy as np
+
+from raycast import line_of_sight
+
+
+class LandmarkVisibility:
+    """
+    Bitset of the landmarks visible from every sample position of a maze.
+    The maze is sampled every resolution pixels (at the centre of every sample square) and the
+    visibility of position (x, y) is the visibility of the sample square containing it, so a
+    query is one lookup instead of a line of sight test per landmark and wall.
+    """
+
+    def __init__(self, bits, num_landmarks, resolution):
+        """
+        :param bits: uint8 array (rows, cols, ceil(num_landmarks / 8)) of packed visibility bits.
+        :param num_landmarks: Number of landmarks.
+        :param resolution: Pixels between two sample positions.
+        """
+        self.bits = bits
+        self.num_landmarks = num_landmarks
+        self.resolution = resolution
+
+    @classmethod
+    def build(cls, occupancy, cell_size, width, height, landmarks, resolution, block_size=4096):
+        """
+        Test the line of sight from every sample position to every landmark.
+        :param occupancy: Boolean numpy array of the walls (rows x cols of the maze grid).
+        :param cell_size: Size of a maze cell in pixels.
+        :param width: Width of the maze in pixels.
+        :param height: Height of the maze in pixels.
+        :param landmarks: List of (x, y) landmark positions.
+        :param resolution: Pixels between two sample positions.
+        :param block_size: Number of sample positions tested in one vectorized call.
+        """
+        landmarks = np.asarray(landmarks, dtype=float).reshape(-1, 2)
+        rows, cols = -(-height // resolution), -(-width // resolution)
+        sample_y, sample_x = np.mgrid[0:rows, 0:cols]
+        sample_x = ((sample_x.ravel() + 0.5) * resolution)[:, None]
+        sample_y = ((sample_y.ravel() + 0.5) * resolution)[:, None]
+
+        visible = np.empty((rows * cols, len(landmarks)), dtype=bool)
+        for start in range(0, rows * cols, block_size):
+            block = slice(start, start + block_size)
+            visible[block] = line_of_sight(occupancy, cell_size, sample_x[block], sample_y[block],
+                                           landmarks[None, :, 0], landmarks[None, :, 1])
+        bits = np.packbits(visible, axis=1).reshape(rows, cols, -1)
+        return cls(bits, len(landmarks), resolution)
+
+    def query(self, x, y):
+        """
+        Return a boolean array, True for every landmark visible from position (x, y).
+        """
+        rows, cols = self.bits.shape[:2]
+        row = min(max(int(y // self.resolution), 0), rows - 1)
+        col = min(max(int(x // self.resolution), 0), cols - 1)
+        return np.unpackbits(self.bits[row, col], count=self.num_landmarks).astype(bool)
+
+    def query_many(self, x, y):
+        """
+        Return a boolean array (N, num_landmarks) of the landmarks visible from N positions.
+        """
+        rows, cols = self.bits.shape[:2]
+        row = np.clip(np.floor_divide(y, self.resolution).astype(int), 0, rows - 1)
+        col = np.clip(np.floor_divide(x, self.resolution).astype(int), 0, cols - 1)
+        bits = np.unpackbits(self.bits[row, col], axis=-1, count=self.num_landmarks)
+        return bits.astype(bool)
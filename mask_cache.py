@@ -0,0 +1,90 @@
+"""
+mask_cache.py: Bounded cache of prebuilt collision masks for walls and robots.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from config.robot_config import MASK_CACHE_SIZE
+
+
+class MaskCache:
+    """
+    Least recently used cache of pygame masks, keyed by the shape they were built for.
+    """
+
+    def __init__(self, max_size=MASK_CACHE_SIZE):
+        """
+        Initialize an empty cache.
+        :param max_size: Maximum number of masks kept, the least recently used one is evicted.
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._masks = OrderedDict()
+
+
+    def wall_mask(self, width, height):
+        """
+        Return the mask of a solid wall rectangle of the given size.
+        """
+        return self._get(("wall", width, height), lambda: self._make_wall_mask(width, height))
+
+
+    def robot_mask(self, radius):
+        """
+        Return the mask of a round robot with the given radius.
+        """
+        return self._get(("robot", radius), lambda: self._make_robot_mask(radius))
+
+
+    def clear(self):
+        """
+        Remove every mask and reset the counters.
+        """
+        self._masks.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+    def _get(self, key, make_mask):
+        """
+        Return the cached mask for key, building it with make_mask on a miss.
+        """
+        mask = self._masks.get(key)
+        if mask is not None:
+            self.hits += 1
+            self._masks.move_to_end(key)
+            return mask
+
+        self.misses += 1
+        mask = make_mask()
+        self._masks[key] = mask
+        if len(self._masks) > self.max_size:
+            self._masks.popitem(last=False)
+        return mask
+
+
+    @staticmethod
+    def _make_wall_mask(width, height):
+        """
+        Build the mask of a solid rectangle.
+        """
+        surface = pygame.Surface((width, height))
+        surface.fill((255, 255, 255))  # Fill white (color does not matter)
+        return pygame.mask.from_surface(surface)
+
+
+    @staticmethod
+    def _make_robot_mask(radius):
+        """
+        Build the mask of a filled circle.
+        """
+        surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA) #pylint: disable=no-member
+        pygame.draw.circle(surface, (255, 0, 0), (radius, radius), radius)
+        return pygame.mask.from_surface(surface)
+
+
+# masks shared by the robot, the collision detection and the calibration tool
+MASK_CACHE = MaskCache()
@@ -2,23 +2,34 @@
 
 from typing import List
 
+import os
 import random
-import pygame
-
-from config.maze_config import NUM_ROOMS, ROOM_SIZE, BLACK, NUM_LANDMARKS, LANDMARK_COLOR
-
-pygame.font.init()
-FONT = pygame.font.SysFont('Arial', 12)
+import hashlib
+import numpy as np
+
+from config.maze_config import NUM_ROOMS, ROOM_SIZE, NUM_LANDMARKS
+from config.robot_config import (SENSOR_MAX_DISTANCE, SENSOR_TABLE_RESOLUTION,
+                                 SENSOR_TABLE_ANGLE_BINS, SENSOR_TABLE_MAX_BYTES,
+                                 LANDMARK_VISIBILITY_RESOLUTION)
+from sensor_table import load_or_build
+from landmark_visibility import LandmarkVisibility
+from spatial_index import WallIndex
+from geometry import Rect
 
 class Maze:
-    """Class to generate and draw a maze."""
+    """Class to generate a maze, drawing is done by render.draw_maze."""
     def __init__(self, width, height, cell_size, grid=None, rect_list=None, landmarks=None):
         self.width = width
         self.height = height
         self.cell_size = cell_size
         self.cols = self.width // self.cell_size
         self.rows = self.height // self.cell_size
-        
+        self._occupancy = None
+        self._sensor_table = None
+        self._sensor_table_path = None
+        self._wall_index = None
+        self._landmark_visibility = None
+
         if grid is None:
             self.grid = [[1 for _ in range(self.cols)] for _ in range(self.rows)]
             self.dfs(1, 1)
@@ -38,11 +49,6 @@ class Maze:
         else:
             self.landmarks = landmarks
 
-        self.dfs(1, 1)
-        self.create_rooms(NUM_ROOMS, ROOM_SIZE)
-        self.make_rects()
-        self.add_landmark(NUM_LANDMARKS)
-
     def dfs(self, start_x, start_y):
         """Generate the maze."""
         stack = [(start_x, start_y)]
@@ -90,7 +96,7 @@ class Maze:
         for x in range(self.rows):
             for y in range(self.cols):
                 if self.grid[x][y] == 1:
-                    self.rect_list.append(pygame.Rect(y * self.cell_size, x * self.cell_size, self.cell_size, self.cell_size))#pylint: disable=line-too-long
+                    self.rect_list.append(Rect(y * self.cell_size, x * self.cell_size, self.cell_size, self.cell_size))#pylint: disable=line-too-long
 
     def add_landmark(self, landmarks):
         """Add a landmark to the maze."""
@@ -108,10 +114,52 @@ class Maze:
                     self.grid[x][y] = 2
                     break
 
-    def draw(self, screen):
-        """Draw the maze."""
-        for rect in self.rect_list:
-            pygame.draw.rect(surface=screen, color=BLACK, rect=rect)
-        for landmark in self.landmarks:
-            pygame.draw.circle(surface=screen, color = LANDMARK_COLOR,
-                               center=landmark, radius=self.cell_size // 4)
+    def __getstate__(self):
+        """
+        Pickle the maze, a sensor table saved to disk is memory-mapped again instead of copied.
+        """
+        state = self.__dict__.copy()
+        if self._sensor_table_path is not None:
+            state["_sensor_table"] = None
+        return state
+
+    def fingerprint(self):
+        """Return a hash identifying the walls and landmarks of the maze."""
+        digest = hashlib.sha1(self.occupancy().tobytes())
+        digest.update(repr((self.cell_size, self.landmarks)).encode())
+        return digest.hexdigest()
+
+    def occupancy(self):
+        """Return the walls of the grid as a boolean numpy array (rows x cols), built once."""
+        if self._occupancy is None:
+            self._occupancy = np.asarray(self.grid) == 1
+        return self._occupancy
+
+    def wall_index(self):
+        """Return the spatial index over the wall rectangles, built once."""
+        if self._wall_index is None:
+            self._wall_index = WallIndex(self.rect_list, self.cell_size)
+        return self._wall_index
+
+    def landmark_visibility(self):
+        """Return the LandmarkVisibility of the maze, built on first use."""
+        if self._landmark_visibility is None:
+            self._landmark_visibility = LandmarkVisibility.build(
+                self.occupancy(), self.cell_size, self.width, self.height, self.landmarks,
+                LANDMARK_VISIBILITY_RESOLUTION)
+        return self._landmark_visibility
+
+    def sensor_table(self, path=None):
+        """
+        Return the precomputed sensor lookup table of the maze, built once per maze.
+        If a path is given the table is memory-mapped from it, or built and saved there; a
+        different path than the one of the cached table loads or builds the table again.
+        """
+        if path is not None and os.fspath(path) != self._sensor_table_path:
+            self._sensor_table = None
+            self._sensor_table_path = os.fspath(path)
+        if self._sensor_table is None:
+            self._sensor_table = load_or_build(self, self._sensor_table_path,
+                                               SENSOR_TABLE_RESOLUTION, SENSOR_TABLE_ANGLE_BINS,
+                                               SENSOR_MAX_DISTANCE, SENSOR_TABLE_MAX_BYTES)
+        return self._sensor_table
@@ -5,12 +5,12 @@ import os
 import pygame
 import pygame_gui
 from maze import Maze
-from config.maze_config import WIDTH, HEIGHT, CELL_SIZE, WHITE, FONT
-from config.robot_config import ROBOT_SPEED
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE, WHITE
+from config.robot_config import ROBOT_SPEED, TRAJECTORY_CAPACITY
 from robot import Robot
+import render
 from evolutionary_algorithm import EvolutionaryAlgorithm
 import numpy as np
-from fitness import fitness
 
 
 class MazeGame:
@@ -24,7 +24,7 @@ class MazeGame:
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         self.clock = pygame.time.Clock()
         self.maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
-        self.robot = Robot(self.maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        self.robot = Robot(self.maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5), TRAJECTORY_CAPACITY)
         self.moving_up = False
         self.moving_down = False
         self.moving_left = False
@@ -190,13 +190,13 @@ class MazeGame:
             print(f"Generation {generation + 1}/{generations}")
             '''
             if generation == 2:
-                best_individual = max(self.evo_algorithm.population, key=lambda ind: fitness(self.robot, ind))
+                best_individual = self.evo_algorithm.best_individual()
                 np.save('ann_weights2.npy', best_individual.get_weights())
                 '''
             self.evo_algorithm.evolve()
         
         # save the best individual for experimentation
-        best_individual = max(self.evo_algorithm.population, key=lambda ind: fitness(self.robot, ind))
+        best_individual = self.evo_algorithm.best_individual()
         #np.save('ann_weights8.npy', best_individual.get_weights())
 
         while running:
@@ -329,18 +329,18 @@ class MazeGame:
                     self.gui_changes["R_t"].append(self.robot.kalman_filter.noise_covariance[2][2])
 
             # create the speed text
-            speed_text = FONT.render(f'wheel power: {vl} | {vr}', True, WHITE)
+            speed_text = render.FONT.render(f'wheel power: {vl} | {vr}', True, WHITE)
 
             # reset the wheel power, to avoid continuous movement
             vr, vl = 0, 0
 
             # draw the maze, robot and speed cltext
             self.screen.fill(WHITE)
-            self.maze.draw(self.screen)
-            self.robot.draw_landmark_raycast(self.screen)
-            self.robot.draw_path(self.screen)
+            render.draw_maze(self.screen, self.maze)
+            render.draw_landmark_raycast(self.screen, self.robot)
+            render.draw_path(self.screen, self.robot)
             self.robot.update_sensors()
-            self.robot.draw(self.screen)
+            render.draw_robot(self.screen, self.robot)
             self.manager.draw_ui(self.screen)
             self.screen.blit(speed_text, (10, 10))
 
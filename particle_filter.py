@@ -0,0 +1,152 @@
+"""
+particle_filter.py: Particle filter localization with the particles stored as a numpy array.
+"""
+
+import numpy as np
+
+from forward_kin import batch_motion_without_collision, grid_collision_flags
+from kalman_filter import wrap_angle
+from config.robot_config import ROBOT_RADIUS
+
+
+class ParticleFilter:
+    """
+    Particle filter with the predict/correct surface of KalmanFilter.
+    The particles are an (N, 3) array of [x, y, theta] hypotheses moved with the diff-drive
+    model (blocked by the walls like the robot when an occupancy grid is given), weighted by
+    the likelihood of the landmark measurements and resampled with low-variance resampling
+    when the weights degenerate.
+    """
+    def __init__(self, num_particles, state_estimate, initial_std, wheel_noise, distance_std,
+                 bearing_std, occupancy=None, cell_size=None, radius=ROBOT_RADIUS, rng=None):
+        """
+        Initialize the particles around a starting state
+        :param num_particles: Number of particles
+        :param state_estimate: Initial state [x, y, theta]
+        :param initial_std: Standard deviations of the initial particles around the state
+        :param wheel_noise: Relative uniform noise applied to the wheel speeds of every particle
+        :param distance_std: Standard deviation of the distance measurements
+        :param bearing_std: Standard deviation of the bearing measurements
+        :param occupancy: Optional boolean wall grid, the particles collide with the walls like
+                          forward_kin.motion_with_grid_collision and get no weight inside a wall
+        :param cell_size: Size of an occupancy cell in pixels
+        :param radius: Radius of the robot used for the collisions
+        :param rng: numpy.random.Generator used for sampling
+        """
+        self.num_particles = num_particles
+        self.wheel_noise = wheel_noise
+        self.distance_std = distance_std
+        self.bearing_std = bearing_std
+        self.occupancy = occupancy
+        self.cell_size = cell_size
+        self.radius = radius
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.particles = np.asarray(state_estimate, dtype=float) \
+            + self.rng.standard_normal((num_particles, 3)) * initial_std
+        self.weights = np.full(num_particles, 1 / num_particles)
+        self._update_estimate()
+
+
+    def predict(self, control_vector):
+        """
+        Prediction step: move every particle with the diff-drive model and noisy wheel speeds
+        :param control_vector: Wheel speeds [vl, vr] of one step, or an array (k, 2) of the
+                               wheel speeds of the k steps since the last prediction
+        """
+        controls = np.asarray(control_vector, dtype=float).reshape(-1, 2)
+        states = np.empty((self.num_particles, 5))
+        for vl, vr in controls:
+            states[:, :3] = self.particles
+            noise = self.rng.uniform(-1, 1, (self.num_particles, 2)) * self.wheel_noise
+            states[:, 3] = vl + noise[:, 0] * vl
+            states[:, 4] = vr + noise[:, 1] * vr
+            x, y, theta = batch_motion_without_collision(states, 1)
+            if self.occupancy is not None:
+                x, y = self._collide(x, y)
+            self.particles[:, 0], self.particles[:, 1], self.particles[:, 2] = x, y, theta
+        self._update_estimate()
+
+
+    def _collide(self, x, y):
+        """
+        Block the moves towards the walls touched before the move and keep the particles in the
+        grid, like RobotBatch.move_with_diff_drive
+        """
+        old_x, old_y = self.particles[:, 0], self.particles[:, 1]
+        blocked = grid_collision_flags(old_x, old_y, self.occupancy, self.cell_size, self.radius)
+        # NORTH, SOUTH, EAST, WEST
+        y = np.where(blocked[:, 0], np.maximum(old_y, y), y)
+        y = np.where(blocked[:, 1], np.minimum(old_y, y), y)
+        x = np.where(blocked[:, 2], np.minimum(old_x, x), x)
+        x = np.where(blocked[:, 3], np.maximum(old_x, x), x)
+        rows, cols = self.occupancy.shape
+        x = np.clip(x, self.radius, cols * self.cell_size - self.radius)
+        y = np.clip(y, self.radius, rows * self.cell_size - self.radius)
+        return x, y
+
+
+    def correct(self, measurement_vector, landmarks, visible=None):
+        """
+        Correction step: weight the particles by the likelihood of the measurements and
+        resample them when the effective number of particles falls below half
+        :param measurement_vector: [bearing, distance] of every used landmark, in order
+        :param landmarks: Positions of all the landmarks
+        :param visible: Optional boolean array, True for the landmarks that were measured
+        """
+        landmarks = np.asarray(landmarks, dtype=float).reshape(-1, 2)
+        if visible is not None:
+            landmarks = landmarks[np.asarray(visible, dtype=bool)]
+        log_likelihood = np.zeros(self.num_particles)
+
+        if len(landmarks):
+            measurements = np.asarray(measurement_vector, dtype=float)
+            dx = landmarks[None, :, 0] - self.particles[:, None, 0]
+            dy = landmarks[None, :, 1] - self.particles[:, None, 1]
+            bearing_error = wrap_angle(measurements[None, 0::2]
+                                       - (np.arctan2(dy, dx) - self.particles[:, None, 2]))
+            distance_error = measurements[None, 1::2] - np.sqrt(dx**2 + dy**2)
+            log_likelihood -= 0.5 * (np.sum((bearing_error / self.bearing_std) ** 2, axis=1)
+                                     + np.sum((distance_error / self.distance_std) ** 2, axis=1))
+
+        log_weights = np.log(np.maximum(self.weights, 1e-300)) + log_likelihood
+        if self.occupancy is not None:
+            rows, cols = self.occupancy.shape
+            grid_x = np.clip((self.particles[:, 0] // self.cell_size).astype(int), 0, cols - 1)
+            grid_y = np.clip((self.particles[:, 1] // self.cell_size).astype(int), 0, rows - 1)
+            log_weights[self.occupancy[grid_y, grid_x]] = -np.inf
+
+        if not np.isfinite(log_weights.max()):
+            # every particle is inside a wall, weight them by the measurements alone so the
+            # resampling pulls the cloud back towards the landmarks
+            log_weights = log_likelihood
+        weights = np.exp(log_weights - log_weights.max())
+        self.weights = weights / weights.sum()
+        if 1 / np.sum(self.weights ** 2) < self.num_particles / 2:
+            self.resample()
+        self._update_estimate()
+
+
+    def resample(self):
+        """
+        Low-variance (systematic) resampling: one random offset and N evenly spaced pointers
+        """
+        positions = (self.rng.random() + np.arange(self.num_particles)) / self.num_particles
+        cumulative = np.cumsum(self.weights)
+        cumulative[-1] = 1.0
+        indices = np.searchsorted(cumulative, positions)
+        self.particles = self.particles[indices]
+        self.weights = np.full(self.num_particles, 1 / self.num_particles)
+
+
+    def _update_estimate(self):
+        """
+        Weighted mean (circular for the angle) and covariance of the particles
+        """
+        weights = self.weights
+        x, y = weights @ self.particles[:, 0], weights @ self.particles[:, 1]
+        theta = np.arctan2(weights @ np.sin(self.particles[:, 2]),
+                           weights @ np.cos(self.particles[:, 2]))
+        self.state_estimate = np.array([x, y, theta])
+        deviation = self.particles - self.state_estimate
+        deviation[:, 2] = wrap_angle(deviation[:, 2])
+        self.error_covariance = (deviation * weights[:, None]).T @ deviation
@@ -0,0 +1,168 @@
+"""
+recorder.py: Columnar binary recording of robot rollouts and a memory-mapped reader to replay them.
+
+A recording is a directory with one raw binary file per column (appended in chunks), the
+start row of every rollout and a small json header describing the columns.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from config.robot_config import NUM_SENSORS
+
+RECORDER_CHUNK_SIZE = 4096
+HEADER_FILE = "header.json"
+ROLLOUTS_FILE = "rollouts.bin"
+
+# name, dtype and per step shape of every column
+COLUMNS = (
+    ("step", "int32", ()),
+    ("x", "float32", ()),
+    ("y", "float32", ()),
+    ("angle", "float32", ()),
+    ("sensors", "float32", (NUM_SENSORS,)),
+    ("vl", "float32", ()),
+    ("vr", "float32", ()),
+    ("estimate", "float32", (3,)), # localizer estimate (x, y, angle), optional
+)
+
+
+class TrajectoryRecorder:
+    """
+    Stream the per step state, sensors, wheel commands and Kalman estimate of rollouts to disk.
+    Steps are buffered in preallocated chunks and appended to the column files when a chunk
+    is full, so any number of rollouts can be recorded with constant memory.
+    """
+
+    def __init__(self, path, chunk_size=RECORDER_CHUNK_SIZE, estimate=True):
+        """
+        Create (or truncate) the recording directory.
+        :param path: Directory of the recording.
+        :param chunk_size: Number of steps buffered before writing to disk.
+        :param estimate: Record the estimate column, leave it out for rollouts that never run
+                         the localizer (like fitness), where it would be constant.
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.columns = tuple(column for column in COLUMNS if estimate or column[0] != "estimate")
+        os.makedirs(path, exist_ok=True)
+        self._buffers = {name: np.empty((chunk_size,) + shape, dtype=dtype)
+                         for name, dtype, shape in self.columns}
+        self._buffered = 0
+        self._rows = 0 # rows written to disk
+        self._rollout_starts = [] # starts not yet written to disk
+        self.rollouts = 0
+        self._step = 0
+        for name, _, _ in self.columns:
+            open(self._column_path(name), "wb").close()
+        open(os.path.join(path, ROLLOUTS_FILE), "wb").close()
+        self._write_header()
+
+    def begin_rollout(self):
+        """Start a new rollout, the following steps belong to it."""
+        self._rollout_starts.append(self._rows + self._buffered)
+        self.rollouts += 1
+        self._step = 0
+
+    def record(self, robot, vl, vr):
+        """
+        Record one step of the robot.
+        :param robot: Robot after the step.
+        :param vl: Left wheel command of the step.
+        :param vr: Right wheel command of the step.
+        """
+        if not self.rollouts:
+            self.begin_rollout()
+        row = self._buffered
+        buffers = self._buffers
+        buffers["step"][row] = self._step
+        buffers["x"][row] = robot.x
+        buffers["y"][row] = robot.y
+        buffers["angle"][row] = robot.angle
+        buffers["sensors"][row] = robot.sensors
+        buffers["vl"][row] = vl
+        buffers["vr"][row] = vr
+        if "estimate" in buffers:
+            buffers["estimate"][row] = robot.state_estimate
+        self._step += 1
+        self._buffered += 1
+        if self._buffered == self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Append the buffered steps and rollout starts to the files."""
+        if self._buffered:
+            for name, _, _ in self.columns:
+                with open(self._column_path(name), "ab") as file:
+                    self._buffers[name][:self._buffered].tofile(file)
+            self._rows += self._buffered
+            self._buffered = 0
+        if self._rollout_starts:
+            with open(os.path.join(self.path, ROLLOUTS_FILE), "ab") as file:
+                np.asarray(self._rollout_starts, dtype=np.int64).tofile(file)
+            self._rollout_starts = []
+        self._write_header()
+
+    def close(self):
+        """Flush the remaining steps."""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _column_path(self, name):
+        return os.path.join(self.path, name + ".bin")
+
+    def _write_header(self):
+        header = {"rows": self._rows,
+                  "columns": [[name, dtype, list(shape)] for name, dtype, shape in self.columns]}
+        with open(os.path.join(self.path, HEADER_FILE), "w", encoding="utf-8") as file:
+            json.dump(header, file)
+
+
+class TrajectoryReader:
+    """
+    Random access to a recording through memory maps, only the pages that are read are loaded.
+    """
+
+    def __init__(self, path):
+        """
+        Open the recording directory written by TrajectoryRecorder.
+        :param path: Directory of the recording.
+        """
+        self.path = path
+        with open(os.path.join(path, HEADER_FILE), encoding="utf-8") as file:
+            header = json.load(file)
+        self.rows = header["rows"]
+        self.columns = {}
+        for name, dtype, shape in header["columns"]:
+            if self.rows:
+                self.columns[name] = np.memmap(os.path.join(path, name + ".bin"), dtype=dtype,
+                                               mode="r", shape=(self.rows,) + tuple(shape))
+            else:
+                self.columns[name] = np.empty((0,) + tuple(shape), dtype=dtype)
+        starts = np.fromfile(os.path.join(path, ROLLOUTS_FILE), dtype=np.int64)
+        starts = starts[starts < self.rows]
+        self._bounds = np.append(starts, self.rows)
+
+    def __len__(self):
+        """Number of recorded rollouts."""
+        return len(self._bounds) - 1
+
+    def __getitem__(self, name):
+        """Memory-mapped column of every recorded step."""
+        return self.columns[name]
+
+    def rollout(self, index):
+        """
+        Return the steps of one rollout.
+        :return: Dictionary of column name to a memory-mapped slice of the rollout's steps.
+        """
+        index = range(len(self))[index]
+        start, end = self._bounds[index], self._bounds[index + 1]
+        return {name: column[start:end] for name, column in self.columns.items()}
@@ -0,0 +1,91 @@
+"""
+render.py: pygame rendering of the maze and the robot.
+The simulation core (maze, robot, forward_kin, fitness) does not import pygame, only the games
+that draw to the screen import this module.
+"""
+# pylint: disable=no-member
+
+import math
+import pygame
+
+from config.maze_config import BLACK, BLUE, LANDMARK_COLOR
+from config.robot_config import (ROBOT_RADIUS, ROBOT_COLOR, SENSOR_COLOR, SENSOR_COLOR_LANDMARK,
+                                 SENSOR_COLOR_FORWARD, TEXT_COLOR, NUM_SENSORS)
+
+pygame.init()
+FONT = pygame.font.SysFont('Arial', 18)
+
+
+def draw_maze(screen, maze):
+    """Draw the maze."""
+    for rect in maze.rect_list:
+        pygame.draw.rect(surface=screen, color=BLACK, rect=rect)
+    for landmark in maze.landmarks:
+        pygame.draw.circle(surface=screen, color = LANDMARK_COLOR,
+                           center=landmark, radius=maze.cell_size // 4)
+
+
+def draw_landmark_raycast(screen, robot):
+    """Draw the raycast from the robot to the visible landmarks on the screen."""
+    visible = robot.visible_landmarks()
+    for i, (lx, ly) in enumerate(robot.maze.landmarks):
+        if visible[i]:
+            angle = math.atan2(ly - robot.y, lx - robot.x)
+            total_distance = math.sqrt((lx - robot.x) ** 2 + (ly - robot.y) ** 2)
+            pygame.draw.line(screen, SENSOR_COLOR_LANDMARK, (robot.x, robot.y), (lx, ly), 2)
+            draw_sensor_text(screen, robot, total_distance, angle)
+
+
+def draw_path(screen, robot):
+    """
+    Draw the robot's path on the screen.
+    """
+    draw_trajectory(screen, robot.past_positions.view(), BLUE) # Draw path in blue
+    draw_trajectory(screen, robot.estimated_positions.view(), (255, 255, 0)) # Draw estimated path in yellow
+
+
+def draw_trajectory(screen, points, color):
+    """
+    Draw a path given as an (n, 2) array of positions.
+    pygame only takes sequences of python number pairs, the ring buffer of the interactive
+    robot (and the replayed step range) bounds the number of points converted every frame.
+    """
+    if len(points) > 1:
+        pygame.draw.lines(screen, color, False, points.tolist(), 2)
+
+
+def draw_sensor_text(screen, robot, sensor_distance, angle, distance_multiplier=1.1):
+    """
+    Draw the sensor distance reading as text on the screen.
+    :param screen: Pygame screen object to draw the text.
+    :param robot: Robot the sensor belongs to.
+    :param sensor_distance: Distance reading from the sensor.
+    :param angle: The angle of the sensor in radians.
+    :param distance_multiplier: How far from the robot the text should appear.
+    """
+    end_x = robot.x + sensor_distance * math.cos(angle) * distance_multiplier
+    end_y = robot.y + sensor_distance * math.sin(angle) * distance_multiplier
+    text_surface = FONT.render(str(int(sensor_distance)), True, TEXT_COLOR)
+    screen.blit(text_surface, (end_x, end_y))
+
+
+def draw_robot(screen, robot):
+    """
+    Draw the robot and its sensors on the screen.
+    """
+    pygame.draw.circle(screen, ROBOT_COLOR, (int(robot.x), int(robot.y)), ROBOT_RADIUS)
+
+    # Sensor that should be highlighted is the one aligned with the angle
+    for i, sensor_distance in enumerate(robot.sensors):
+        sensor_angle = robot.angle + i * (2 * math.pi / NUM_SENSORS)
+        end_x = robot.x + sensor_distance * math.cos(sensor_angle) + ROBOT_RADIUS * math.cos(sensor_angle) # pylint: disable=line-too-long
+        end_y = robot.y + sensor_distance * math.sin(sensor_angle) + ROBOT_RADIUS * math.sin(sensor_angle) # pylint: disable=line-too-long
+
+        # Forward sensor direction check
+        if i == 0:
+            sensor_color = SENSOR_COLOR_FORWARD
+        else:
+            sensor_color = SENSOR_COLOR
+
+        pygame.draw.line(screen, sensor_color, (robot.x, robot.y), (end_x, end_y), 2)
+        draw_sensor_text(screen, robot, sensor_distance, sensor_angle)
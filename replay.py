@@ -0,0 +1,128 @@
+"""
+replay.py: Render rollouts recorded by recorder.TrajectoryRecorder instead of simulating them live.
+Any step can be drawn directly, so a viewer can play at any speed, seek and scrub backwards,
+and an image of the final frame takes one render instead of a whole real time run.
+"""
+# pylint: disable=no-member
+
+import numpy as np
+import pygame
+
+from config.maze_config import WIDTH, HEIGHT, WHITE, BLUE
+from recorder import TrajectoryReader
+from robot import Robot
+import render
+
+ESTIMATE_COLOR = (255, 255, 0)
+
+
+class ReplayViewer:
+    """
+    Draw the recorded steps of a rollout in the maze it was recorded in.
+    """
+
+    def __init__(self, maze, recording, rollout=0):
+        """
+        Initialize the viewer.
+        :param maze: Maze the rollouts were recorded in.
+        :param recording: TrajectoryReader, or the directory of a recording.
+        :param rollout: Index of the rollout to show.
+        """
+        self.maze = maze
+        self.reader = recording if isinstance(recording, TrajectoryReader) \
+            else TrajectoryReader(recording)
+        # robot placed at the recorded states, used for the drawing and the landmark rays
+        self.robot = Robot(maze, (0, 0))
+        self.select(rollout)
+
+    def select(self, rollout):
+        """Show another rollout, starting at its first step."""
+        self.steps = self.reader.rollout(rollout)
+        self.step = 0
+
+    def __len__(self):
+        """Number of steps of the current rollout."""
+        return len(self.steps["step"])
+
+    def seek(self, step):
+        """Go to a step, negative steps count from the end, out of range steps are clamped."""
+        if step < 0:
+            step += len(self)
+        self.step = min(max(step, 0), len(self) - 1)
+        return self.step
+
+    def draw(self, screen, step=None):
+        """
+        Draw the maze, the path up to the step, the landmark rays and the robot.
+        :param step: Step to draw, the current step by default.
+        """
+        if step is not None:
+            self.seek(step)
+        steps, index = self.steps, self.step
+        robot = self.robot
+        robot.x, robot.y = float(steps["x"][index]), float(steps["y"][index])
+        robot.angle = float(steps["angle"][index])
+        robot.sensors = steps["sensors"][index].tolist()
+
+        screen.fill(WHITE)
+        render.draw_maze(screen, self.maze)
+        render.draw_landmark_raycast(screen, robot)
+        xy = slice(0, index + 1)
+        render.draw_trajectory(screen, _points(steps["x"][xy], steps["y"][xy]), BLUE)
+        if "estimate" in steps:
+            render.draw_trajectory(screen, steps["estimate"][xy, :2], ESTIMATE_COLOR)
+        render.draw_robot(screen, robot)
+
+    def save_frame(self, path, step=-1):
+        """
+        Render a single step offscreen and save it as an image, the last step by default.
+        """
+        screen = pygame.Surface((WIDTH, HEIGHT))
+        self.draw(screen, step)
+        pygame.image.save(screen, path)
+
+    def run(self, speed=1, fps=60):
+        """
+        Play the rollout in a window.
+        Right/left: skip forward/backward, up/down: one step per frame faster/slower
+        (negative speeds play backwards), space: pause, home/end: first/last step, escape: quit.
+        :param speed: Number of recorded steps advanced every frame.
+        :param fps: Frames per second.
+        """
+        screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Maze Robot Replay")
+        clock = pygame.time.Clock()
+        paused = False
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        running = False
+                    elif event.key == pygame.K_SPACE:
+                        paused = not paused
+                    elif event.key == pygame.K_RIGHT:
+                        self.seek(self.step + max(abs(speed), 1))
+                    elif event.key == pygame.K_LEFT:
+                        self.seek(self.step - max(abs(speed), 1))
+                    elif event.key == pygame.K_UP:
+                        speed += 1
+                    elif event.key == pygame.K_DOWN:
+                        speed -= 1
+                    elif event.key == pygame.K_HOME:
+                        self.seek(0)
+                    elif event.key == pygame.K_END:
+                        self.seek(-1)
+            if not paused:
+                self.seek(self.step + speed)
+            self.draw(screen)
+            pygame.display.flip()
+            clock.tick(fps)
+        pygame.quit()
+
+
+def _points(x, y):
+    """Stack the x and y columns into an (n, 2) array of positions."""
+    return np.stack([x, y], axis=1)
@@ -4,20 +4,24 @@ robot.py: A simple robot class that can move around a maze.
 
 import math
 import random
-import pygame
 import numpy as np
-import matplotlib.pyplot as plt
 
 from maze import Maze
-from config.maze_config import CELL_SIZE, WIDTH, HEIGHT, FONT, BLUE
-from config.robot_config import (ROBOT_RADIUS, ROBOT_COLOR, SENSOR_COLOR, SENSOR_COLOR_LANDMARK,
-                          TEXT_COLOR, NUM_SENSORS, SENSOR_MAX_DISTANCE, SENSOR_COLOR_FORWARD,
-                          SENSOR_NOISE_DEFAULT,WHEEL_NOISE_DEFAULT, KALMAN_CALL_INTERVAL)
+from config.maze_config import CELL_SIZE, WIDTH, HEIGHT
+from config.robot_config import (ROBOT_RADIUS, NUM_SENSORS, SENSOR_MAX_DISTANCE,
+                          SENSOR_NOISE_DEFAULT,WHEEL_NOISE_DEFAULT, KALMAN_CALL_INTERVAL,
+                          SENSOR_MODEL_DEFAULT, SENSOR_TABLE_INTERPOLATE, COLLISION_MODEL_DEFAULT,
+                          VISIBILITY_MODEL_DEFAULT)
 from config.kalman_config import (NOISE_COVARIANCE_MEASUREMENT_FALSE, NOISE_COVARIANCE_MEASUREMENT_TRUE,
-                                  NOISE_COVARIANCE_X, NOISE_COVARIANCE_Y, NOISE_COVARIANCE_THETA)
-from kalman_filter import KalmanFilter
-from forward_kin import motion_with_collision
+                                  NOISE_COVARIANCE_X, NOISE_COVARIANCE_Y, NOISE_COVARIANCE_THETA,
+                                  KALMAN_CORRECTION_DEFAULT, LOCALIZER_DEFAULT, PARTICLE_COUNT,
+                                  PARTICLE_INITIAL_STD, PARTICLE_DISTANCE_STD, PARTICLE_BEARING_STD)
+from kalman_filter import KalmanFilter, wrap_angle
+from particle_filter import ParticleFilter
+from forward_kin import motion_with_collision, motion_with_grid_collision
 from ann import ANNController
+from raycast import batch_raycast, dda_raycast, line_of_sight
+from trajectory import Trajectory
 
 
 class Robot:
@@ -25,25 +29,48 @@ class Robot:
     Robot with sensors to navigate and sense the maze.
     """
 
-    def __init__(self, maze: Maze, start_pos):
+    def __init__(self, maze: Maze, start_pos, trajectory_capacity=None):
         """
         Initialize the robot.
         :param maze: Maze object which the robot will navigate.
         :param start_pos: Tuple (x, y) for the starting position of the robot.
+        :param trajectory_capacity: Number of steps of history kept (ring buffer), None keeps
+                                    every step since the last reset.
         """
         self.maze : Maze = maze
+        self.start_pos = tuple(start_pos)
         self.x, self.y = start_pos
         self.sensors = [0] * NUM_SENSORS
         self.angle = 0
         self.prev_x, self.prev_y = 0, 0
-        self.mask = self._make_mask()
-        self.past_positions = [(self.x, self.y)]
-        self.beacon_count = [0]
-        self.estimated_positions = [(self.x, self.y)] # Store estimated positions for drawing later
+        self._mask = None
+        self.past_positions = Trajectory(2, trajectory_capacity)
+        self.past_positions.append((self.x, self.y))
+        self.beacon_count = Trajectory(None, trajectory_capacity, dtype=np.int32)
+        self.beacon_count.append(0)
+        # Store estimated positions for drawing later
+        self.estimated_positions = Trajectory(2, trajectory_capacity)
+        self.estimated_positions.append((self.x, self.y))
+        # step (index in past_positions since the reset) of every estimate and beacon count
+        self.estimate_steps = Trajectory(None, trajectory_capacity, dtype=np.int64)
+        self.estimate_steps.append(0)
+        # cells under the recorded positions, updated every step, with their running count
         self.explored_grid = np.zeros((HEIGHT // CELL_SIZE, WIDTH // CELL_SIZE), dtype=bool)
+        # explored count after every recorded position
+        self.coverage = Trajectory(None, trajectory_capacity, dtype=np.int32)
+        self._reset_explored()
         self.wheel_noise = WHEEL_NOISE_DEFAULT
         self.sensor_noise = SENSOR_NOISE_DEFAULT
         self.kalman_call_interval = KALMAN_CALL_INTERVAL
+        self.sensor_model = SENSOR_MODEL_DEFAULT
+        self.collision_model = COLLISION_MODEL_DEFAULT
+        self.visibility_model = VISIBILITY_MODEL_DEFAULT
+        self.kalman_correction = KALMAN_CORRECTION_DEFAULT
+        self.localizer = LOCALIZER_DEFAULT
+        self.particle_count = PARTICLE_COUNT
+        # built on the first particle filter run, with the wheel commands since the last run
+        self.particle_filter = None
+        self._odometry = []
 
         #TODO: (tiago) please set the defaults in the Kalm class, and remove the defaults here
         # Initialize the Kalman filter
@@ -73,55 +100,90 @@ class Robot:
                                                                     #2 for left and right wheel power
 
 
+    def __getstate__(self):
+        """
+        Pickle the robot without its collision mask (a pygame object), it is rebuilt on demand.
+        """
+        state = self.__dict__.copy()
+        state["_mask"] = None
+        return state
+
+
+    @property
+    def mask(self):
+        """
+        Collision mask of the robot, only built for the "mask" collision model as it needs pygame.
+        """
+        if self._mask is None:
+            self._mask = self._make_mask()
+        return self._mask
+
+
     def _make_mask(self):
         """
         Create a mask for the robot.
         """
-        dot_surface = pygame.Surface((ROBOT_RADIUS * 2, ROBOT_RADIUS * 2), pygame.SRCALPHA) #pylint: disable=no-member
-        pygame.draw.circle(dot_surface, SENSOR_COLOR, (ROBOT_RADIUS, ROBOT_RADIUS), ROBOT_RADIUS)
-        dot_mask = pygame.mask.from_surface(dot_surface)
-
-        return dot_mask
+        from mask_cache import MASK_CACHE # pylint: disable=import-outside-toplevel
+        return MASK_CACHE.robot_mask(ROBOT_RADIUS)
 
 
     def update_sensors(self, angle=0):
         """
         Update the sensor readings based on the robot's current position.
+        The readings are computed with the raycasting engine selected by self.sensor_model.
         """
+        sensor_angles = self.angle + angle + np.arange(NUM_SENSORS) * (2 * math.pi / NUM_SENSORS)
+        if self.sensor_model == "batch":
+            self.sensors = batch_raycast(self.maze.occupancy(), CELL_SIZE, self.x, self.y,
+                                         sensor_angles, SENSOR_MAX_DISTANCE,
+                                         start_offset=ROBOT_RADIUS).tolist()
+            return
+
+        if self.sensor_model == "dda":
+            self.sensors = dda_raycast(self.maze.occupancy(), CELL_SIZE, self.x, self.y,
+                                       sensor_angles, SENSOR_MAX_DISTANCE,
+                                       start_offset=ROBOT_RADIUS).tolist()
+            return
+
+        if self.sensor_model == "table":
+            # the table stores distances from the center, the sensors start at the robot's edge
+            distances = self.maze.sensor_table().lookup(self.x, self.y, sensor_angles,
+                                                        interpolate=SENSOR_TABLE_INTERPOLATE)
+            self.sensors = np.maximum(distances - ROBOT_RADIUS, 0).tolist()
+            return
+
+        if self.sensor_model != "step":
+            raise ValueError(f"Unknown sensor model: {self.sensor_model}")
+
         for i in range(NUM_SENSORS):
             sensor_angle = self.angle + i * (2 * math.pi / NUM_SENSORS)
             self.sensors[i] = self._raycast(sensor_angle + angle, 'wall')
 
 
-    def draw_landmark_raycast(self, screen):
-        """Draw the raycast to the landmarks on the screen."""
-        for (lx, ly) in self.maze.landmarks:
-            angle = math.atan2(ly - self.y, lx - self.x)
-            total_distance = math.sqrt((lx - self.x) ** 2 + (ly - self.y) ** 2)
-            is_obstructed = False
-
-            # Initialize ray's position to this starting point on the robot's circumference
-            x, y = self.x, self.y
-
-            # Calculate the unit vector for the ray
-            dx = math.cos(angle)
-            dy = math.sin(angle)
+    def visible_landmarks(self):
+        """
+        Check the line of sight from the robot to every landmark.
+        The "table" visibility model looks up the precomputed visibility of the maze, "grid"
+        traverses the occupancy grid and "clip" clips the line against every wall rectangle.
+        :return: Boolean numpy array, True for every landmark in line of sight.
+        """
+        if self.visibility_model == "table":
+            return self.maze.landmark_visibility().query(self.x, self.y)
 
-            for _ in range(int(total_distance)):
-                x += dx
-                y += dy
-                grid_x, grid_y = int(x // CELL_SIZE), int(y // CELL_SIZE)
+        if self.visibility_model == "grid":
+            landmarks = np.asarray(self.maze.landmarks, dtype=float).reshape(-1, 2)
+            return line_of_sight(self.maze.occupancy(), CELL_SIZE, self.x, self.y,
+                                 landmarks[:, 0], landmarks[:, 1])
 
-                # Check if the ray has hit a wall in the maze
-                if grid_y >= len(self.maze.grid)\
-                    or grid_x >= len(self.maze.grid[0])\
-                    or self.maze.grid[grid_y][grid_x] == 1:
-                    is_obstructed = True
+        if self.visibility_model != "clip":
+            raise ValueError(f"Unknown visibility model: {self.visibility_model}")
+        visible = np.ones(len(self.maze.landmarks), dtype=bool)
+        for i, (lx, ly) in enumerate(self.maze.landmarks):
+            for wall in self.maze.rect_list:
+                if wall.clipline((self.x, self.y), (lx, ly)):
+                    visible[i] = False
                     break
-
-            if not is_obstructed:
-                pygame.draw.line(screen, SENSOR_COLOR_LANDMARK, (self.x, self.y), (lx, ly), 2)
-                self._draw_sensor_text(screen, total_distance, angle)
+        return visible
 
 
     def _check_wall_collision(self, grid_x, grid_y):
@@ -199,13 +261,22 @@ class Robot:
         state[4] += random.uniform(-vr, vr) * self.wheel_noise
 
         # Update the state
-        new_state = motion_with_collision(state, 1, self.maze.rect_list, self.mask)
+        if self.collision_model == "grid":
+            new_state = motion_with_grid_collision(state, 1, self.maze.occupancy(), CELL_SIZE)
+        elif self.collision_model == "mask":
+            new_state = motion_with_collision(state, 1, self.maze.rect_list, self.mask,
+                                              self.maze.wall_index())
+        else:
+            raise ValueError(f"Unknown collision model: {self.collision_model}")
 
         # Update the robot's position
         self.x, self.y, self.angle = new_state[0], new_state[1], new_state[2]
+        if self.localizer == "particle":
+            self._odometry.append((vl, vr))
 
         # Add the current position to past positions
         self.past_positions.append((self.x, self.y))
+        self._mark_explored(self.x, self.y)
 
         # Check for collision with the outer edges of the window
         self.x = max(self.x, ROBOT_RADIUS)
@@ -217,134 +288,131 @@ class Robot:
     def run_kalman_filter(self, vl, vr):
         """
         Run the Kalman filter to estimate the robot's position.
+        The "visible" correction only measures and corrects with the landmarks in line of
+        sight, the "full" correction uses every landmark and gives the occluded ones a high
+        measurement noise.
+        With the "particle" localizer the particle filter is moved with every wheel command
+        since its last run and corrected with the visible landmarks instead.
         """
+        if self.localizer == "particle":
+            self._run_particle_filter()
+            return
+        if self.localizer != "kalman":
+            raise ValueError(f"Unknown localizer: {self.localizer}")
+
         # Kalman filter predict and correct steps
         control_vector = np.array([vl, vr])
         self.kalman_filter.predict(control_vector)
 
-        # Update measurement_vector with actual landmark data
-        measurement_vector = []
-        counter = 0
-        for i, (lx, ly) in enumerate(self.maze.landmarks):
-            # check if a wall is obstructing the line of sight to the landmark
-            line_of_sight = True
-            for wall in self.maze.rect_list:
-                if wall.clipline((self.x, self.y), (lx, ly)):
-                    line_of_sight = False
-                    break
-
-            # calculate the bearing and distance to the landmark
-            dx = lx - self.x
-            dy = ly - self.y
-            distance = np.sqrt(dx ** 2 + dy ** 2)
-            bearing = np.arctan2(dy, dx) - self.angle
-
-            #add noise to the sensor reading
-            distance += random.uniform(-distance, distance) * self.sensor_noise
-            bearing += random.uniform(-bearing, bearing) * self.sensor_noise
-
-            # add the bearing and distance to the measurement vector
-            measurement_vector.extend([bearing, distance])
-
-
-            # if there is a line of sight add the bearing and distance to the measurement vector
-            if line_of_sight:
-                # increment the counter, beacon is visible
-                counter += 1
-
-                # set default uncertainty for the measurement
-                self.kalman_filter.noise_covariance_measurement[i][i] = self.noise_covariance_measurement_true
-                self.kalman_filter.noise_covariance_measurement[i + 1][i + 1] = self.noise_covariance_measurement_true
-
-            else:
-
-                # Add high uncertainty to the measurement
-                self.kalman_filter.noise_covariance_measurement[i][i] = self.noise_covariance_measurement_false
-                self.kalman_filter.noise_covariance_measurement[i + 1][i + 1] = self.noise_covariance_measurement_false
+        # check if a wall is obstructing the line of sight to the landmarks
+        visible = self.visible_landmarks()
+        if self.kalman_correction == "visible":
+            indices = np.flatnonzero(visible)
+        elif self.kalman_correction == "full":
+            indices = np.arange(len(self.maze.landmarks))
+        else:
+            raise ValueError(f"Unknown Kalman correction: {self.kalman_correction}")
+
+        # calculate the bearing and distance to the landmarks
+        landmarks = np.asarray(self.maze.landmarks, dtype=float).reshape(-1, 2)[indices]
+        dx = landmarks[:, 0] - self.x
+        dy = landmarks[:, 1] - self.y
+        distance = np.sqrt(dx ** 2 + dy ** 2)
+        bearing = np.arctan2(dy, dx) - self.angle
+
+        #add noise to the sensor reading
+        for i in range(len(indices)):
+            distance[i] += random.uniform(-distance[i], distance[i]) * self.sensor_noise
+            bearing[i] += random.uniform(-bearing[i], bearing[i]) * self.sensor_noise
+
+        # add the bearing and distance to the measurement vector
+        measurement_vector = np.empty(2 * len(indices))
+        measurement_vector[0::2] = bearing
+        measurement_vector[1::2] = distance
+
+        # default uncertainty for the visible landmarks, high uncertainty for the others
+        noise = np.where(visible[indices], self.noise_covariance_measurement_true,
+                         self.noise_covariance_measurement_false)
+        rows = np.stack([2 * indices, 2 * indices + 1], axis=1).ravel()
+        self.kalman_filter.noise_covariance_measurement[rows, rows] = np.repeat(noise, 2)
 
         # add number of beacons to history
-        self.beacon_count.append(counter)
-
-        # Convert the measurement vector to a numpy array
-        measurement_vector = np.array(measurement_vector)
+        self.beacon_count.append(np.count_nonzero(visible))
 
         # Correct step in Kalman filter
-        self.kalman_filter.correct(measurement_vector, self.maze.landmarks)
+        if self.kalman_correction == "visible":
+            self.kalman_filter.correct_visible(measurement_vector, self.maze.landmarks, visible)
+        else:
+            self.kalman_filter.correct(measurement_vector, self.maze.landmarks)
 
         # Store estimated positions for drawing
         estimated_position = self.kalman_filter.state_estimate
         self.estimated_positions.append((estimated_position[0], estimated_position[1]))
+        self.estimate_steps.append(self.past_positions.appended - 1)
 
 
-    def draw_path(self, screen):
-        """
-        Draw the robot's path on the screen.
-        """
-        if len(self.past_positions) > 1:
-            pygame.draw.lines(screen, BLUE, False, self.past_positions, 2)  # Draw path in blue
-
-        if len(self.estimated_positions) > 1:
-            pygame.draw.lines(screen, (255, 255, 0), False, self.estimated_positions, 2)  # Draw estimated path in yellow pylint: disable=line-too-long
-
-
-    def _draw_sensor_text(self, screen, sensor_distance, angle, distance_multiplier=1.1):
-        """
-        Draw the sensor distance reading as text on the screen.
-        :param screen: Pygame screen object to draw the text.
-        :param sensor_distance: Distance reading from the sensor.
-        :param angle: The angle of the sensor in radians.
-        :param distance_multiplier: How far from the robot the text should appear.
-        """
-        end_x = self.x + sensor_distance * math.cos(angle) * distance_multiplier
-        end_y = self.y + sensor_distance * math.sin(angle) * distance_multiplier
-        text_surface = FONT.render(str(int(sensor_distance)), True, TEXT_COLOR)
-        screen.blit(text_surface, (end_x, end_y))
-
-
-    def draw(self, screen):
+    def _run_particle_filter(self):
         """
-        Draw the robot on the screen. 
+        Predict the particles with the buffered wheel commands and correct them with noisy
+        measurements of the landmarks in line of sight.
         """
-        pygame.draw.circle(screen, ROBOT_COLOR, (int(self.x), int(self.y)), ROBOT_RADIUS)
-
-        # Sensor that should be highlighted is the one aligned with the angle
-        for i, sensor_distance in enumerate(self.sensors):
-            sensor_angle = self.angle + i * (2 * math.pi / NUM_SENSORS)
-            end_x = self.x + sensor_distance * math.cos(sensor_angle) + ROBOT_RADIUS * math.cos(sensor_angle) # pylint: disable=line-too-long
-            end_y = self.y + sensor_distance * math.sin(sensor_angle) + ROBOT_RADIUS * math.sin(sensor_angle) # pylint: disable=line-too-long
+        if self.particle_filter is None:
+            self.particle_filter = ParticleFilter(self.particle_count, self.start_pos + (0,),
+                                                  PARTICLE_INITIAL_STD, self.wheel_noise,
+                                                  PARTICLE_DISTANCE_STD, PARTICLE_BEARING_STD,
+                                                  self.maze.occupancy(), CELL_SIZE)
+        if self._odometry:
+            self.particle_filter.wheel_noise = self.wheel_noise
+            self.particle_filter.predict(self._odometry)
+        self._odometry.clear()
+
+        # bearing and distance to the visible landmarks, the bearing is wrapped before its relative
+        # noise so the noise stays within the PARTICLE_BEARING_STD the filter assumes
+        visible = self.visible_landmarks()
+        landmarks = np.asarray(self.maze.landmarks, dtype=float).reshape(-1, 2)[visible]
+        dx = landmarks[:, 0] - self.x
+        dy = landmarks[:, 1] - self.y
+        distance = np.sqrt(dx ** 2 + dy ** 2)
+        bearing = wrap_angle(np.arctan2(dy, dx) - self.angle)
+        distance += np.random.uniform(-1, 1, len(distance)) * distance * self.sensor_noise
+        bearing += np.random.uniform(-1, 1, len(bearing)) * bearing * self.sensor_noise
+
+        measurement_vector = np.empty(2 * len(landmarks))
+        measurement_vector[0::2] = bearing
+        measurement_vector[1::2] = distance
+        self.beacon_count.append(np.count_nonzero(visible))
+
+        self.particle_filter.correct(measurement_vector, self.maze.landmarks, visible)
+        estimated_position = self.particle_filter.state_estimate
+        self.estimated_positions.append((estimated_position[0], estimated_position[1]))
+        self.estimate_steps.append(self.past_positions.appended - 1)
 
-            # Forward sensor direction check
-            if i == 0:
-                sensor_color = SENSOR_COLOR_FORWARD
-            else:
-                sensor_color = SENSOR_COLOR
 
-            pygame.draw.line(screen, sensor_color, (self.x, self.y), (end_x, end_y), 2)
-            self._draw_sensor_text(screen, sensor_distance, sensor_angle)
+    @property
+    def state_estimate(self):
+        """Estimated [x, y, theta] of the active localizer."""
+        if self.localizer == "particle" and self.particle_filter is not None:
+            return self.particle_filter.state_estimate
+        return self.kalman_filter.state_estimate
 
 
     def plot_error(self):
         """
-        Plot the log difference between every 30th updated estimated position and the past positions
+        Plot the log difference between the estimated positions and the past positions of the
+        same steps, the steps whose position was dropped from the ring buffers are skipped
         """
-        update_interval = self.kalman_call_interval
-        
-        # Indices that correspond to the estimated updates
-        past_indices = np.arange(0, len(self.past_positions), update_interval)
-        est_indices = np.arange(0, len(self.estimated_positions))
-        
-        # Only keep indices that are within bounds
-        common_indices = np.minimum(len(est_indices), len(past_indices))
-        past_indices = past_indices[:common_indices]
-        est_indices = est_indices[:common_indices]
+        import matplotlib.pyplot as plt # pylint: disable=import-outside-toplevel
 
-        # Use only those indices to fetch past and estimated positions
-        past_positions = [self.past_positions[i] for i in past_indices]
-        estimated_positions = [self.estimated_positions[i] for i in est_indices]
+        # steps of the estimates, and the step of the oldest past position still kept
+        steps = self.estimate_steps.view()
+        first_step = self.past_positions.appended - len(self.past_positions)
+        kept = steps >= first_step
+        past_indices = steps[kept]
 
-        # Convert lists of tuples to numpy arrays for vectorized operations
-        past = np.array(past_positions)
-        estimated = np.array(estimated_positions)
+        # positions of the same steps (float64 for the errors)
+        past = self.past_positions.view()[past_indices - first_step].astype(float)
+        estimated = self.estimated_positions.view()[kept].astype(float)
+        beacons = self.beacon_count.view()[kept]
 
         # Compute the squared differences for each coordinate
         squared_errors = np.sum((past - estimated) ** 2, axis=1)
@@ -355,9 +423,9 @@ class Robot:
         plt.figure(figsize=(10, 6))
 
         plt.plot(past_indices, log_errors, label='Log Error')
-        plt.plot(past_indices, self.beacon_count[-len(past_indices):], label='Beacon Count')
+        plt.plot(past_indices, beacons, label='Beacon Count')
 
-        plt.xlabel('Time Step (Every 30th frame)')
+        plt.xlabel('Time Step')
         plt.ylabel('Shared y-axis for Log Error and Beacon Count')
         plt.title('Kalman Filter Squared Error')
         plt.legend()
@@ -376,22 +444,46 @@ class Robot:
     
     def reset(self):
         """Reset the robot to its initial state."""
-        self.x, self.y = self.past_positions[0]
+        self.x, self.y = self.start_pos
         self.angle = 0
         self.sensors = [0] * NUM_SENSORS
-        self.past_positions = [(self.x, self.y)]
-        self.beacon_count = [0]
-        self.estimated_positions = [(self.x, self.y)]
+        self.past_positions.clear()
+        self.past_positions.append((self.x, self.y))
+        self.beacon_count.clear()
+        self.beacon_count.append(0)
+        self.estimated_positions.clear()
+        self.estimated_positions.append((self.x, self.y))
+        self.estimate_steps.clear()
+        self.estimate_steps.append(0)
         self.kalman_filter.state_estimate = np.array([self.x, self.y, self.angle])
         self.kalman_filter.error_covariance = np.eye(3)
+        self.particle_filter = None
+        self._odometry.clear()
+        self._reset_explored()
         self.update_sensors()
 
-    def calculate_explored_area(self):
-        """Calculate the area explored by the robot."""
-        for x, y in self.past_positions:
-            grid_x = int(x // CELL_SIZE)
-            grid_y = int(y // CELL_SIZE)
+    def _reset_explored(self):
+        """
+        Forget the explored cells and the coverage curve, only the current cell is explored.
+        Without it the fitness of a reused robot (a pool worker) would depend on the rollouts it
+        ran before.
+        """
+        self.explored_grid[:] = False
+        self.explored_count = 0
+        self.coverage.clear()
+        self._mark_explored(self.x, self.y)
+
+    def _mark_explored(self, x, y):
+        """Mark the cell of a recorded position as explored and extend the coverage curve."""
+        grid_x = int(x // CELL_SIZE)
+        grid_y = int(y // CELL_SIZE)
+        if not self.explored_grid[grid_y, grid_x]:
             self.explored_grid[grid_y, grid_x] = True
-        return np.sum(self.explored_grid)
+            self.explored_count += 1
+        self.coverage.append(self.explored_count)
+
+    def calculate_explored_area(self):
+        """Return the number of cells explored by the robot."""
+        return self.explored_count
 
 
@@ -0,0 +1,156 @@
+"""
+sensor_table.py: Precomputed lookup table of wall distances for a static maze.
+"""
+
+import os
+import json
+import numpy as np
+
+from raycast import dda_raycast
+
+HEADER_SUFFIX = ".json" # the header describing a saved table is stored next to it
+
+
+class SensorTable:
+    """
+    Quantized wall distances keyed by (sample position, sensor angle bin).
+    The positions are sampled on a regular lattice every `resolution` pixels and the distances
+    are measured from the sample position itself, not from the edge of the robot.
+    """
+
+    def __init__(self, distances, resolution):
+        """
+        Wrap a table of distances.
+        :param distances: Array (rows x cols x angle_bins) of distances, may be a memmap.
+        :param resolution: Distance in pixels between two sample positions.
+        """
+        self.distances = distances
+        self.resolution = resolution
+        self.angle_bins = distances.shape[2]
+
+
+    @staticmethod
+    def table_bytes(width, height, resolution, angle_bins):
+        """
+        Return the memory in bytes used by a table with the given settings.
+        """
+        return (height // resolution + 1) * (width // resolution + 1) * angle_bins * 4
+
+
+    @classmethod
+    def build(cls, occupancy, cell_size, width, height, resolution, angle_bins, max_distance,
+              max_bytes=None):
+        """
+        Build the table by casting a ray per angle bin from every sample position.
+        :param occupancy: Boolean numpy array (rows x cols), True where there is a wall.
+        :param cell_size: Size of a grid cell in pixels.
+        :param width: Width of the maze in pixels.
+        :param height: Height of the maze in pixels.
+        :param resolution: Distance in pixels between two sample positions.
+        :param angle_bins: Number of angle bins over the full circle.
+        :param max_distance: Maximum distance of a ray.
+        :param max_bytes: Memory budget of the table, a ValueError is raised if it is exceeded.
+        """
+        size = cls.table_bytes(width, height, resolution, angle_bins)
+        if max_bytes is not None and size > max_bytes:
+            raise ValueError(f"Sensor table needs {size} bytes, the budget is {max_bytes} bytes. "
+                             "Increase the resolution or reduce the angle bins.")
+
+        sample_x = np.arange(width // resolution + 1) * resolution
+        sample_y = np.arange(height // resolution + 1) * resolution
+        angles = np.arange(angle_bins) * (2 * np.pi / angle_bins)
+
+        distances = np.empty((len(sample_y), len(sample_x), angle_bins), dtype=np.float32)
+        # one row of sample positions at a time keeps the temporary arrays small
+        for row, y in enumerate(sample_y):
+            distances[row] = dda_raycast(occupancy, cell_size, sample_x[:, None], y,
+                                         angles[None, :], max_distance)
+
+        return cls(distances, resolution)
+
+
+    def save(self, path, header=None):
+        """
+        Save the table as a .npy file, which can be memory-mapped by load().
+        :param header: Optional dict describing the table (see table_header), saved next to it.
+        """
+        np.save(path, np.asarray(self.distances))
+        if header is not None:
+            with open(os.fspath(path) + HEADER_SUFFIX, "w", encoding="utf-8") as file:
+                json.dump(header, file)
+
+
+    @classmethod
+    def load(cls, path, resolution, mmap_mode='r'):
+        """
+        Load a table saved with save(), memory-mapped by default so processes share the pages.
+        """
+        return cls(np.load(path, mmap_mode=mmap_mode), resolution)
+
+
+    def lookup(self, x, y, angles, interpolate=False):
+        """
+        Look up the distance to the nearest wall from (x, y) in the direction of the angles.
+        :param x: x-coordinate(s) of the query position(s), broadcastable against angles.
+        :param y: y-coordinate(s) of the query position(s), broadcastable against angles.
+        :param angles: Angle(s) in radians, snapped to the nearest angle bin.
+        :param interpolate: Interpolate bilinearly between the four surrounding sample positions
+                            instead of using the nearest one.
+        :return: Numpy array with the distances.
+        """
+        x, y, angles = np.broadcast_arrays(np.asarray(x, dtype=float),
+                                           np.asarray(y, dtype=float),
+                                           np.asarray(angles, dtype=float))
+        rows, cols, _ = self.distances.shape
+        angle_bin = np.rint(angles * (self.angle_bins / (2 * np.pi))).astype(int) % self.angle_bins
+
+        grid_x = np.clip(x / self.resolution, 0, cols - 1)
+        grid_y = np.clip(y / self.resolution, 0, rows - 1)
+
+        if not interpolate:
+            return self.distances[np.rint(grid_y).astype(int), np.rint(grid_x).astype(int),
+                                  angle_bin].astype(float)
+
+        x0 = np.minimum(np.floor(grid_x).astype(int), cols - 2)
+        y0 = np.minimum(np.floor(grid_y).astype(int), rows - 2)
+        fx = grid_x - x0
+        fy = grid_y - y0
+        top = (1 - fx) * self.distances[y0, x0, angle_bin] + fx * self.distances[y0, x0 + 1, angle_bin]
+        bottom = (1 - fx) * self.distances[y0 + 1, x0, angle_bin] \
+            + fx * self.distances[y0 + 1, x0 + 1, angle_bin]
+        return (1 - fy) * top + fy * bottom
+
+
+def table_header(maze, resolution, angle_bins, max_distance):
+    """
+    Return the dict identifying the table of the maze built with the given settings.
+    """
+    return {"maze": maze.fingerprint(), "resolution": resolution, "angle_bins": angle_bins,
+            "max_distance": max_distance}
+
+
+def read_header(path):
+    """
+    Return the header saved with the table at path, None if there is none.
+    """
+    header_path = os.fspath(path) + HEADER_SUFFIX
+    if not os.path.exists(header_path):
+        return None
+    with open(header_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def load_or_build(maze, path, resolution, angle_bins, max_distance, max_bytes=None):
+    """
+    Load the table of the maze from path if it exists and its header matches the maze and the
+    settings, otherwise build it and save it there (replacing a stale table).
+    """
+    header = table_header(maze, resolution, angle_bins, max_distance)
+    if path is not None and os.path.exists(path) and read_header(path) == header:
+        return SensorTable.load(path, resolution)
+
+    table = SensorTable.build(maze.occupancy(), maze.cell_size, maze.width, maze.height,
+                              resolution, angle_bins, max_distance, max_bytes)
+    if path is not None:
+        table.save(path, header)
+    return table
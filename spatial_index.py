@@ -0,0 +1,43 @@
+"""
+spatial_index.py: Broad-phase spatial index over the wall rectangles of the maze.
+"""
+
+
+class WallIndex:
+    """
+    Uniform grid of buckets keyed by cell, holding the indices of the wall rectangles
+    that overlap the cell.
+    """
+
+    def __init__(self, rect_list, cell_size):
+        """
+        Build the index.
+        :param rect_list: List of wall rectangles (x, y, width, height).
+        :param cell_size: Size of a bucket in pixels, the cell size of the maze.
+        """
+        self.rect_list = rect_list
+        self.cell_size = cell_size
+        self.buckets = {}
+
+        for index, rect in enumerate(rect_list):
+            first_x, last_x = rect.x // cell_size, (rect.x + rect.width - 1) // cell_size
+            first_y, last_y = rect.y // cell_size, (rect.y + rect.height - 1) // cell_size
+            for grid_x in range(first_x, last_x + 1):
+                for grid_y in range(first_y, last_y + 1):
+                    self.buckets.setdefault((grid_x, grid_y), []).append(index)
+
+
+    def query(self, x, y, radius):
+        """
+        Return the wall rectangles that may overlap the square of half size radius around (x, y),
+        in the same order as in the rectangle list.
+        """
+        first_x, last_x = int((x - radius) // self.cell_size), int((x + radius) // self.cell_size)
+        first_y, last_y = int((y - radius) // self.cell_size), int((y + radius) // self.cell_size)
+
+        indices = set()
+        for grid_x in range(first_x, last_x + 1):
+            for grid_y in range(first_y, last_y + 1):
+                indices.update(self.buckets.get((grid_x, grid_y), ()))
+
+        return [self.rect_list[index] for index in sorted(indices)]
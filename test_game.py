@@ -3,6 +3,7 @@ This file is used to compare different ANN configurations in the same maze envir
 '''
 
 import os
+import tempfile
 import multiprocessing
 import numpy as np
 import matplotlib.pyplot as plt
@@ -11,8 +12,16 @@ import pygame
 import pygame_gui
 from maze import Maze
 from config.maze_config import WIDTH, HEIGHT, CELL_SIZE, WHITE
+from config.robot_config import TRAJECTORY_CAPACITY
 from robot import Robot
+import render
 from evolutionary_algorithm import EvolutionaryAlgorithm
+from ann import ANNController
+from fitness import fitness
+from recorder import TrajectoryRecorder
+from replay import ReplayViewer
+
+REPLAY_STEPS = 170 * 60 # steps of a live run at 60 fps: it ends 200 s after the start but waits 30 s first
 
 
 class TestGame:
@@ -28,7 +37,7 @@ class TestGame:
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         self.clock = pygame.time.Clock()
         self.maze = Maze(WIDTH, HEIGHT, CELL_SIZE, grid=grid, rect_list=rect_list, landmarks=landmarks)
-        self.robot = Robot(self.maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        self.robot = Robot(self.maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5), TRAJECTORY_CAPACITY)
         self.manager = pygame_gui.UIManager((WIDTH, HEIGHT))
         self.evo_algorithm = EvolutionaryAlgorithm(population_size=20, input_size=12, hidden_size=10, output_size=2, robot=self.robot)
         self.population_file = population_file
@@ -60,11 +69,11 @@ class TestGame:
                 self.robot.move_with_diff_drive(vl, vr)
 
             self.screen.fill(WHITE)
-            self.maze.draw(self.screen)
-            self.robot.draw_landmark_raycast(self.screen)
-            self.robot.draw_path(self.screen)
+            render.draw_maze(self.screen, self.maze)
+            render.draw_landmark_raycast(self.screen, self.robot)
+            render.draw_path(self.screen, self.robot)
             self.robot.update_sensors()
-            self.robot.draw(self.screen)
+            render.draw_robot(self.screen, self.robot)
             self.manager.draw_ui(self.screen)
 
             pygame.display.flip()
@@ -96,9 +105,33 @@ def run_experiment(weight_file, grid, rect_list, landmarks):
     return game.run()
 
 
-def main():
+def replay_experiment(weight_file, grid, rect_list, landmarks, steps=REPLAY_STEPS):
+    '''
+    simulate the weight file headless while recording the rollout, then render only its final
+    frame, instead of running the live game in real time, and return the explored area.
+    the recording is kept in a temporary directory and the final frame is written where the
+    live run writes it. the rollout uses the exact "dda" sensors, about twice as fast as the per
+    pixel "step" ones, so a replay takes a few seconds. the localizer is not run, so no
+    estimate is recorded
+    '''
+    name = weight_file.replace(".npy", "")
+    maze = Maze(WIDTH, HEIGHT, CELL_SIZE, grid=grid, rect_list=rect_list, landmarks=landmarks)
+    robot = Robot(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+    robot.sensor_model = "dda"
+    controller = ANNController(12, 10, 2)
+    controller.set_weights(np.load(weight_file))
+
+    with tempfile.TemporaryDirectory(prefix=f'replay_{name}_') as recording:
+        with TrajectoryRecorder(recording, estimate=False) as recorder:
+            explored_area = fitness(robot, controller, steps=steps, recorder=recorder)
+        ReplayViewer(maze, recording).save_frame(f'final_{name}.png')
+    return explored_area
+
+
+def main(replay=True):
     '''
-    run the main function to compare different ANN configurations in the same maze environment
+    run the main function to compare different ANN configurations in the same maze environment,
+    with replay the runs are simulated headless and only their final frames are rendered
     '''
     maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
     grid, rect_list, landmarks = maze.grid, maze.rect_list, maze.landmarks
@@ -116,7 +149,8 @@ def main():
     
     # use multiprocessing to run experiments in parallel
     pool = multiprocessing.Pool(processes=8)
-    results = pool.starmap(run_experiment, [(wf, grid, rect_list, landmarks) for wf in weight_files])
+    experiment = replay_experiment if replay else run_experiment
+    results = pool.starmap(experiment, [(wf, grid, rect_list, landmarks) for wf in weight_files])
 
     # plotting results for all 6 experiments
     rows = 2
@@ -0,0 +1,72 @@
+"""This test module checks the ann module"""
+import copy
+
+import numpy as np
+import pytest
+
+from ann import ANNController, PopulationController
+
+
+class TestPopulationController:
+    """Test the batched forward pass of a population"""
+    def test_forward_matches_controllers(self):
+        """checks that the batched recurrent steps match the individual controllers"""
+        np.random.seed(0)
+        controllers = [ANNController(12, 10, 2) for _ in range(5)]
+        population = PopulationController.from_controllers(copy.deepcopy(controllers))
+
+        for _ in range(10):
+            inputs = np.random.uniform(0, 200, size=(5, 12))
+            outputs = population.forward(inputs)
+            expected = np.array([controller.forward(row) for controller, row in zip(controllers, inputs)])
+            assert np.allclose(outputs, expected)
+
+    def test_weights_round_trip(self):
+        """checks that genomes move between the population and single controllers unchanged"""
+        np.random.seed(0)
+        controllers = [ANNController(12, 10, 2) for _ in range(4)]
+        population = PopulationController.from_controllers(controllers)
+
+        assert np.array_equal(population.get_weights(),
+                              np.stack([controller.get_weights() for controller in controllers]))
+        assert np.array_equal(population.controller(2).get_weights(), controllers[2].get_weights())
+
+        # a single saved genome is loaded into every individual
+        population.set_weights(controllers[1].get_weights())
+        assert np.array_equal(population.get_weights()[3], controllers[1].get_weights())
+
+
+class TestGenomeStorage:
+    """Test the flat genome buffer behind the weight matrices"""
+    def test_weight_matrices_are_views(self):
+        """checks that writing the genome changes the weight matrices without copies"""
+        np.random.seed(0)
+        controller = ANNController(12, 10, 2)
+        weights = controller.get_weights()
+        weights[0] = 100
+        assert controller.genome[0] != 100 # get_weights returns a copy
+        controller.set_weights(np.arange(controller.num_weights(), dtype=float))
+        assert controller.weights_input_hidden[0, 1] == 1
+        assert controller.weights_hidden_output[-1, -1] == controller.num_weights() - 1
+
+        clone = copy.deepcopy(controller)
+        clone.genome[0] = -1
+        assert clone.weights_input_hidden[0, 0] == -1
+        assert controller.weights_input_hidden[0, 0] == 0
+
+    def test_set_weights_lengths(self):
+        """checks that extra weights are ignored like before and missing ones are refused"""
+        controller = ANNController(12, 10, 2)
+        controller.set_weights(np.arange(controller.num_weights() + 5, dtype=float))
+        assert controller.genome[-1] == controller.num_weights() - 1
+        with pytest.raises(ValueError):
+            controller.set_weights(np.zeros(controller.num_weights() - 1))
+
+    def test_wraps_population_row(self):
+        """checks that a controller of the population writes into the genome matrix"""
+        np.random.seed(0)
+        population = PopulationController(3, 12, 10, 2)
+        controller = population.controller(1)
+        controller.weights_hidden_hidden[:] = 0
+        assert not population.weights_hidden_hidden[1].any()
+        assert population.weights_hidden_hidden[0].any()
@@ -0,0 +1,95 @@
+"""This test module checks the batch_sim module"""
+import random
+
+import numpy as np
+
+from ann import ANNController
+from batch_sim import RobotBatch
+from fitness import fitness_batch
+from maze import Maze
+from robot import Robot
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
+
+
+class TestRobotBatch:
+    """Test the structure-of-arrays simulator"""
+    def test_matches_single_robot(self):
+        """checks that every robot of the batch follows the same path as a Robot"""
+        random.seed(0)
+        np.random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        start = (CELL_SIZE * 1.5, CELL_SIZE * 1.5)
+        speeds = np.random.uniform(0, 2, size=(3, 200, 2))
+
+        batch = RobotBatch(maze, start, 3, wheel_noise=0)
+        robots = [Robot(maze, start) for _ in range(3)]
+        for robot in robots:
+            robot.wheel_noise = 0
+            robot.collision_model = "grid"
+            robot.sensor_model = "dda"
+            robot.update_sensors()
+
+        for step in range(200):
+            batch.move_with_diff_drive(speeds[:, step, 0], speeds[:, step, 1])
+            batch.update_sensors()
+            for robot, (vl, vr) in zip(robots, speeds[:, step]):
+                robot.move_with_diff_drive(vl, vr)
+                robot.update_sensors()
+
+        for i, robot in enumerate(robots):
+            assert np.isclose(batch.x[i], robot.x) and np.isclose(batch.y[i], robot.y)
+            assert np.isclose(batch.angle[i], robot.angle)
+            assert np.allclose(batch.sensors[i], robot.sensors)
+            assert batch.explored_count[i] == robot.calculate_explored_area()
+
+    def test_fitness_batch(self):
+        """checks that the batch fitness returns one explored area per controller"""
+        random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        controllers = [ANNController(12, 10, 2) for _ in range(4)]
+        batch = RobotBatch(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5), 4)
+        scores = fitness_batch(batch, controllers, steps=50)
+        assert scores.shape == (4,) and np.all(scores >= 1)
+
+    def test_kalman_filter_matches_single_robot(self):
+        """checks that the filter bank localizes every robot like Robot.run_kalman_filter"""
+        random.seed(0)
+        np.random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        start = (CELL_SIZE * 1.5, CELL_SIZE * 1.5)
+        speeds = np.random.uniform(0, 2, size=(3, 60, 2))
+
+        for mode in ("full", "visible"):
+            batch = RobotBatch(maze, start, 3, wheel_noise=0)
+            batch.sensor_noise = 0
+            batch.kalman_correction = mode
+            robots = [Robot(maze, start) for _ in range(3)]
+            for robot in robots:
+                robot.wheel_noise = robot.sensor_noise = 0
+                robot.collision_model = "grid"
+                robot.kalman_correction = mode
+
+            for step in range(60):
+                batch.move_with_diff_drive(speeds[:, step, 0], speeds[:, step, 1])
+                estimates = batch.run_kalman_filter(speeds[:, step, 0], speeds[:, step, 1])
+                for robot, (vl, vr) in zip(robots, speeds[:, step]):
+                    robot.move_with_diff_drive(vl, vr)
+                    robot.run_kalman_filter(vl, vr)
+
+            for i, robot in enumerate(robots):
+                assert np.allclose(estimates[i], robot.kalman_filter.state_estimate, atol=1e-6)
+                assert batch.beacon_count[i] == robot.beacon_count.last()
+
+    def test_visibility_matches_single_robot(self):
+        """checks that the batch sees the same landmarks as a Robot with the exact default model"""
+        random.seed(0)
+        np.random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        batch = RobotBatch(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5), 50)
+        batch.x, batch.y = np.random.uniform(0, WIDTH, 50), np.random.uniform(0, HEIGHT, 50)
+        robot = Robot(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        assert robot.visibility_model == batch.visibility_model == "grid"
+        visible = batch.visible_landmarks()
+        for i in range(50):
+            robot.x, robot.y = batch.x[i], batch.y[i]
+            assert np.array_equal(visible[i], robot.visible_landmarks())
@@ -0,0 +1,122 @@
+"""This test module checks the evolutionary_algorithm module"""
+import random
+
+import numpy as np
+import pytest
+
+from evaluators import SerialEvaluator
+from evolutionary_algorithm import EvolutionaryAlgorithm
+from fitness import EarlyStopping
+from maze import Maze
+from robot import Robot
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
+
+
+class TestParallelEvaluation:
+    """Test the process pool evaluation"""
+    def test_parallel_matches_serial(self):
+        """checks that seeded serial and parallel evaluations return the same scores in order"""
+        random.seed(0)
+        np.random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        robot = Robot(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+
+        serial = EvolutionaryAlgorithm(6, 12, 10, 2, robot, seed=3)
+        parallel = EvolutionaryAlgorithm(6, 12, 10, 2, robot, workers=2, seed=3)
+        parallel.population = serial.population
+        try:
+            expected = serial.evaluate_fitness()
+            assert np.array_equal(parallel.evaluate_fitness(), expected)
+            assert np.array_equal(parallel.evaluate_fitness(), expected)
+        finally:
+            parallel.close()
+
+
+class TestFitnessCache:
+    """Test the memoization of the fitness scores"""
+    def test_unchanged_individuals_are_not_simulated_again(self):
+        """checks that a second evaluation of the same population is served from the cache"""
+        random.seed(0)
+        np.random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        robot = Robot(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+
+        evo = EvolutionaryAlgorithm(4, 12, 10, 2, robot, seed=3)
+        evo.population.append(evo.population[0])
+        first = evo.evaluate_fitness()
+        assert evo.fitness_cache.stats() == {"hits": 0, "misses": 5, "size": 4}
+
+        second = evo.evaluate_fitness()
+        assert np.array_equal(first, second)
+        assert evo.fitness_cache.hits == 5
+
+    def test_context_change_invalidates_scores(self):
+        """checks that changing the evaluation seed does not reuse the cached scores"""
+        random.seed(0)
+        np.random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        robot = Robot(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+
+        evo = EvolutionaryAlgorithm(3, 12, 10, 2, robot, seed=3)
+        evo.evaluate_fitness()
+        evo.seed = 4
+        evo.evaluate_fitness()
+        assert evo.fitness_cache.hits == 0
+        assert len(evo.fitness_cache) == 6
+
+
+    def test_unseeded_runs_are_not_cached(self):
+        """checks that noisy unseeded rollouts are simulated every time"""
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        assert EvolutionaryAlgorithm(2, 12, 10, 2, robot).fitness_cache is None
+
+    def test_steps_are_part_of_the_context(self):
+        """checks that the rollout length given to the EA is used and keys the cache"""
+        random.seed(0)
+        np.random.seed(0)
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        evo = EvolutionaryAlgorithm(2, 12, 10, 2, robot, seed=3, steps=20)
+        short = evo.evaluate_fitness()
+        assert np.array_equal(short, SerialEvaluator(robot, (12, 10, 2), 3, steps=20)(
+            np.stack([individual.genome for individual in evo.population])))
+        evo.steps = 200
+        evo.evaluate_fitness()
+        assert evo.fitness_cache.hits == 0 and len(evo.fitness_cache) == 4
+
+    def test_seeded_batch_evaluation(self):
+        """checks that a seeded batch gives the same scores twice and is not cached per genome"""
+        random.seed(0)
+        np.random.seed(0)
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        evo = EvolutionaryAlgorithm(8, 12, 10, 2, robot, batch_evaluation=True, seed=3)
+        assert evo.fitness_cache is None
+        first = evo.evaluate_fitness()
+        np.random.seed(1) # the global generator does not matter
+        assert np.array_equal(evo.evaluate_fitness(), first)
+
+class TestEarlyStoppingEvaluation:
+    """Test the evaluation modes supporting early stopping"""
+    def test_rejects_parallel_and_batch_evaluation(self):
+        """checks that early stopping is refused where it would silently do nothing"""
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        with pytest.raises(ValueError):
+            EvolutionaryAlgorithm(2, 12, 10, 2, robot, workers=2, early_stopping=EarlyStopping())
+        with pytest.raises(ValueError):
+            EvolutionaryAlgorithm(2, 12, 10, 2, robot, batch_evaluation=True,
+                                  early_stopping=EarlyStopping())
+
+
+class TestReproducibility:
+    """Test the seeding of the selection and variation"""
+    def test_seeded_runs_create_the_same_children(self):
+        """checks that two runs with the same seed select the same parents and children"""
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        runs = [EvolutionaryAlgorithm(5, 12, 10, 2, robot, mutation_rate=0.5, seed=7) for _ in range(2)]
+        runs[1].population = runs[0].population
+        fitness_scores = np.arange(1.0, 6.0)
+        children = []
+        for evo in runs:
+            np.random.seed(len(children)) # the global generator does not matter
+            parents = evo.select_parents(fitness_scores)
+            children.append(evo.create_child(*parents).get_weights())
+        assert np.array_equal(children[0], children[1])
@@ -0,0 +1,62 @@
+"""This test module checks the fitness module"""
+import random
+
+import numpy as np
+
+from ann import ANNController
+from evaluators import seeded_fitness
+from fitness import EarlyStopping, max_step_distance
+from forward_kin import batch_motion_without_collision
+from maze import Maze
+from robot import Robot
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
+
+
+class TestEarlyStopping:
+    """Test the early termination of rollouts"""
+    def setup_method(self):
+        """seeded maze, robot and controllers"""
+        random.seed(0)
+        np.random.seed(0)
+        self.robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        self.sizes = (12, 10, 2)
+        self.genomes = [ANNController(*self.sizes).get_weights() for _ in range(8)]
+        self.full = [seeded_fitness(self.robot, genome, self.sizes, 1) for genome in self.genomes]
+
+    def test_finished_rollouts_are_unchanged(self):
+        """checks that stagnation only stops rollouts and never changes finished scores"""
+        early_stopping = EarlyStopping(stagnation_steps=50)
+        for genome, full in zip(self.genomes, self.full):
+            score = seeded_fitness(self.robot, genome, self.sizes, 1, early_stopping)
+            if early_stopping.last_stopped:
+                assert score <= full
+            else:
+                assert score == full
+        assert early_stopping.stats()["rollouts"] == len(self.genomes)
+
+    def test_upper_bound_is_safe(self):
+        """checks that a rollout is only stopped if it could not reach the threshold"""
+        threshold = max(self.full)
+        early_stopping = EarlyStopping(threshold=threshold, stagnation_steps=10**6)
+        for genome, full in zip(self.genomes, self.full):
+            score = seeded_fitness(self.robot, genome, self.sizes, 1, early_stopping)
+            if early_stopping.last_stopped:
+                assert full < threshold
+            else:
+                assert score == full
+        assert early_stopping.steps_saved > 0
+
+
+class TestStepDistance:
+    """Test the bound on the distance of one step"""
+    def test_bounds_the_kinematics(self):
+        """checks that no step moves farther than the bound, also where the kinematics move
+        farther than the wheel speed"""
+        rng = np.random.default_rng(0)
+        for speed in (1.1, 20.0, 40.0):
+            states = np.zeros((100000, 5))
+            states[:, 2] = rng.uniform(0, 2 * np.pi, len(states))
+            states[:, 3:] = rng.uniform(-speed, speed, (len(states), 2))
+            x, y, _ = batch_motion_without_collision(states, 1)
+            assert np.hypot(x, y).max() <= max_step_distance(speed)
+        assert max_step_distance(40.0) > 40.0
@@ -1,5 +1,14 @@
 """This test module checks the forward_kin module"""
-from forward_kin import wall_angle, motion_without_collison
+import random
+
+import numpy as np
+
+from forward_kin import (wall_angle, motion_without_collison, collision_type, collision_type_grid,
+                         grid_collision_flags, motion_with_grid_collision, CARDINALS,
+                         batch_motion_without_collision)
+from maze import Maze
+from robot import Robot
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
 
 class TestWallAngle:
     """Test the wall angle function"""
@@ -56,3 +65,88 @@ class TestMotionWithoutCollision:
         #check both wheels spinning
         x, y, theta = motion_without_collison([0, 0, 0, 1, 2], 1)
         assert x != 0.0 and y != 0.0 and theta != 0.0
+
+class TestBatchMotionWithoutCollision:
+    """Test the vectorized motion without collision function against the scalar one"""
+    def assert_matches_scalar(self, states, d_t=1):
+        """checks every state of the batch against motion_without_collison"""
+        x, y, theta = batch_motion_without_collision(states, d_t)
+        for i, state in enumerate(states):
+            expected = motion_without_collison(list(state), d_t)
+            assert np.allclose((x[i], y[i], theta[i]), expected, rtol=0, atol=1e-9)
+
+    def test_special_cases(self):
+        """checks the straight line, rotation in place and standing still cases"""
+        states = np.array([[0, 0, 0, 1, 1], [0, 0, 0, -1, -1], [5, 5, 1, 1, -1],
+                           [5, 5, 1, -1, 1], [5, 5, 1, 0, 0]], dtype=float)
+        self.assert_matches_scalar(states)
+
+    def test_general_case(self):
+        """checks curved motion over random states"""
+        np.random.seed(0)
+        states = np.random.uniform(-2, 2, size=(200, 5))
+        states[:, :2] *= 100
+        self.assert_matches_scalar(states)
+        self.assert_matches_scalar(states, d_t=0.5)
+
+    def test_broadcasting(self):
+        """checks that a grid of states keeps its shape"""
+        states = np.random.uniform(-2, 2, size=(4, 3, 5))
+        x, y, theta = batch_motion_without_collision(states, 1)
+        assert x.shape == y.shape == theta.shape == (4, 3)
+        self.assert_matches_scalar(states.reshape(-1, 5))
+
+class TestCollisionType:
+    """Test the collision detection"""
+    def test_wall_index_matches_full_scan(self):
+        """checks that the spatial index reports the same collisions as testing every wall"""
+        random.seed(0)
+        np.random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        robot = Robot(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+
+        collisions = 0
+        for x, y in np.random.uniform(0, [WIDTH, HEIGHT], size=(300, 2)):
+            state = [x, y, 0, 0, 0]
+            expected = collision_type(state, maze.rect_list, robot.mask)
+            result = collision_type(state, maze.rect_list, robot.mask, maze.wall_index())
+            assert result == expected
+            collisions += len(expected)
+        assert collisions > 0
+
+
+class TestCollisionTypeGrid:
+    """Test the analytic circle vs grid collision detection"""
+    occupancy = np.array([[1, 1, 1, 1],
+                          [1, 0, 0, 1],
+                          [1, 0, 0, 1],
+                          [1, 1, 1, 1]], dtype=bool)
+
+    def test_no_collision(self):
+        """checks that a robot away from the walls does not collide"""
+        assert not collision_type_grid([80, 80], self.occupancy, 40, 13)
+
+    def test_cardinal_collisions(self):
+        """checks that a robot touching a wall reports the direction of the wall"""
+        assert collision_type_grid([50, 80], self.occupancy, 40, 13) == ["WEST"]
+        assert collision_type_grid([110, 80], self.occupancy, 40, 13) == ["EAST"]
+        assert collision_type_grid([80, 50], self.occupancy, 40, 13) == ["NORTH"]
+        assert collision_type_grid([80, 110], self.occupancy, 40, 13) == ["SOUTH"]
+        assert collision_type_grid([50, 50], self.occupancy, 40, 13) == ["NORTH", "WEST"]
+
+    def test_vectorized_flags(self):
+        """checks that the vectorized test matches the scalar test"""
+        np.random.seed(0)
+        positions = np.random.uniform(0, 160, size=(500, 2))
+        flags = grid_collision_flags(positions[:, 0], positions[:, 1], self.occupancy, 40, 13)
+        for position, position_flags in zip(positions, flags):
+            expected = collision_type_grid(position, self.occupancy, 40, 13)
+            assert [d for d, flag in zip(CARDINALS, position_flags) if flag] == expected
+
+    def test_blocked_motion(self):
+        """checks that the robot can not move into a wall but can move away from it"""
+        x, y, _ = motion_with_grid_collision([50, 80, np.pi, 1, 1], 1, self.occupancy, 40, 13)
+        assert x == 50 and np.isclose(y, 80)
+
+        x, y, _ = motion_with_grid_collision([50, 80, 0, 1, 1], 1, self.occupancy, 40, 13)
+        assert x == 51 and y == 80
@@ -0,0 +1,56 @@
+"""This test module checks the generational module"""
+import random
+
+import numpy as np
+
+from evaluators import SerialEvaluator, BatchEvaluator
+from generational import GenerationalEA, select
+from maze import Maze
+from robot import Robot
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
+
+
+class TestSelect:
+    """Test the vectorized selection"""
+    def test_fitter_individuals_are_selected_more(self):
+        """checks that every method favours the fittest individual"""
+        rng = np.random.default_rng(0)
+        fitness_scores = np.array([1.0, 2.0, 3.0, 10.0])
+        for method in ("roulette", "tournament", "rank"):
+            counts = np.bincount(select(fitness_scores, 4000, method, rng), minlength=4)
+            assert counts.argmax() == 3
+            assert counts[0] < counts[3]
+
+
+class TestGenerationalEA:
+    """Test the generational engine"""
+    def test_elites_are_kept(self):
+        """checks that the best fitness never decreases with elitism and a seeded evaluator"""
+        rng = np.random.default_rng(0)
+
+        def evaluator(genomes):
+            return -np.abs(genomes).sum(axis=1)
+
+        ea = GenerationalEA(30, 3, 4, 2, evaluator, mutation_rate=0.1, elitism=2, rng=rng)
+        best = ea.run(15)
+        assert all(b2 >= b1 for b1, b2 in zip(best, best[1:]))
+        assert best[-1] > best[0]
+        assert np.array_equal(ea.fitness, evaluator(ea.genomes))
+
+    def test_robot_evaluators(self):
+        """checks that the engine runs with the simulator evaluators"""
+        random.seed(0)
+        np.random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        robot = Robot(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        sizes = (12, 10, 2)
+
+        serial = GenerationalEA(4, *sizes, SerialEvaluator(robot, sizes, seed=1), elitism=1,
+                                rng=np.random.default_rng(0))
+        batch = GenerationalEA(4, *sizes, BatchEvaluator(robot, sizes), elitism=1,
+                               rng=np.random.default_rng(0))
+        for ea in (serial, batch):
+            ea.step()
+            assert ea.fitness.shape == (4,)
+            assert (ea.fitness >= 1).all()
+            assert ea.best_individual().get_weights().shape == (ea.genomes.shape[1],)
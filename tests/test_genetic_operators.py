@@ -0,0 +1,46 @@
+"""This test module checks the genetic_operators module"""
+import numpy as np
+
+import genetic_operators
+
+
+class TestCrossover:
+    """Test the crossover masks and the crossover"""
+    def test_single_point_takes_a_prefix(self):
+        """checks that every child takes a prefix of its first parent and the rest of the second"""
+        rng = np.random.default_rng(0)
+        mask = genetic_operators.point_crossover_mask(50, 20, 1, rng)
+        # once a child switches to the second parent it never switches back
+        assert not (np.diff(mask.astype(int), axis=1) > 0).any()
+
+    def test_multi_point_alternates(self):
+        """checks that the parents alternate at most num_points times"""
+        rng = np.random.default_rng(0)
+        mask = genetic_operators.point_crossover_mask(50, 20, 3, rng)
+        switches = (np.diff(mask.astype(int), axis=1) != 0).sum(axis=1)
+        assert switches.max() <= 3
+        assert (switches > 1).any()
+
+    def test_make_children(self):
+        """checks that without crossover and mutation the children copy their first parent"""
+        rng = np.random.default_rng(0)
+        genomes = rng.standard_normal((4, 30))
+        parents = np.array([[0, 1], [2, 3], [3, 0]])
+        for method in genetic_operators.CROSSOVER_METHODS:
+            children = genetic_operators.make_children(genomes, parents, 0, 0, rng, method)
+            assert np.array_equal(children, genomes[parents[:, 0]])
+
+        children = genetic_operators.make_children(genomes, parents, 1, 0, rng, "uniform")
+        from_either = (children == genomes[parents[:, 0]]) | (children == genomes[parents[:, 1]])
+        assert from_either.all()
+
+
+class TestMutate:
+    """Test the mutation"""
+    def test_mutation_rate(self):
+        """checks that roughly mutation_rate of the weights change, in place"""
+        rng = np.random.default_rng(0)
+        genomes = np.zeros((100, 100))
+        result = genetic_operators.mutate(genomes, 0.1, rng)
+        assert result is genomes
+        assert 0.08 < np.count_nonzero(genomes) / genomes.size < 0.12
@@ -0,0 +1,25 @@
+"""This test module checks that the simulation core runs without pygame"""
+import subprocess
+import sys
+
+
+def test_simulation_core_does_not_import_pygame():
+    """checks that a fitness rollout imports neither pygame nor matplotlib"""
+    code = (
+        "import sys\n"
+        "from maze import Maze\n"
+        "from robot import Robot\n"
+        "from fitness import fitness\n"
+        "from evolutionary_algorithm import EvolutionaryAlgorithm\n"
+        "maze = Maze(1000, 800, 40)\n"
+        "robot = Robot(maze, (60, 60))\n"
+        "robot.collision_model = 'grid'\n"
+        "algorithm = EvolutionaryAlgorithm(2, 12, 10, 2, robot)\n"
+        "fitness(robot, algorithm.population[0], steps=20)\n"
+        "robot.run_kalman_filter(1, 1)\n"
+        "assert 'pygame' not in sys.modules, 'pygame was imported'\n"
+        "assert 'matplotlib' not in sys.modules, 'matplotlib was imported'\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            check=False)
+    assert result.returncode == 0, result.stderr
@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from kalman_filter import KalmanFilter
+from kalman_filter import KalmanFilter, KalmanFilterBank
 
 @pytest.fixture
 def kf():
@@ -35,3 +35,80 @@ def test_predict_and_correct(kf):
 def test_initial_state(kf):
     kalman_filter, _ = kf
     assert kalman_filter.state_estimate.tolist() == [0, 0, 0], "Initial state is not as expected"
+
+def test_jacobian_matches_numerical(kf):
+    kalman_filter, _ = kf
+    rng = np.random.default_rng(0)
+    landmarks = rng.uniform(0, 1000, size=(20, 2))
+    for _ in range(20):
+        state = np.array([*rng.uniform(0, 1000, 2), rng.uniform(-10, 10)])
+        analytic = kalman_filter.jacobian_c(state, landmarks)
+        numerical = kalman_filter.jacobian_c_numerical(state, landmarks, epsilon=1e-6)
+        assert np.allclose(analytic, numerical, rtol=1e-4, atol=1e-6)
+
+def test_bearing_wrap_around(kf):
+    kalman_filter, _ = kf
+    landmarks = [(-10, -0.001), (-10, 0.001)]  # just below and above the -x axis
+    state = np.array([0.0, 0.0, 4 * np.pi])
+    measurements = kalman_filter.h(state, landmarks)
+    assert np.all(np.abs(measurements[0::2]) <= np.pi)
+    assert np.allclose(kalman_filter.h(np.array([0.0, 0.0, 0.0]), landmarks), measurements)
+
+    # a bearing reported a full turn away does not move the estimate
+    kalman_filter.state_estimate = state
+    measurements[0::2] += 2 * np.pi
+    kalman_filter.correct(measurements, landmarks)
+    assert np.allclose(kalman_filter.state_estimate, state)
+
+def test_correct_visible_matches_full_correction():
+    rng = np.random.default_rng(0)
+    landmarks = rng.uniform(0, 100, size=(6, 2))
+    visible = np.array([True, False, True, True, False, False])
+    R = np.diag(rng.uniform(0.01, 0.1, 12))
+    rows = np.array([0, 1, 4, 5, 6, 7])
+
+    def make_filter(noise):
+        P = np.diag([2.0, 3.0, 0.1])
+        return KalmanFilter(np.eye(3), np.zeros((3, 2)), None, np.eye(3), noise,
+                            np.array([50.0, 40.0, 0.3]), P)
+
+    true_state = np.array([52.0, 38.0, 0.25])
+    measurements = make_filter(R).h(true_state, landmarks[visible])
+
+    subset = make_filter(R[np.ix_(rows, rows)])
+    subset.correct(measurements, landmarks[visible])
+    kalman_filter = make_filter(R)
+    kalman_filter.correct_visible(measurements, landmarks, visible)
+
+    assert np.allclose(kalman_filter.state_estimate, subset.state_estimate)
+    assert np.allclose(kalman_filter.error_covariance, subset.error_covariance)
+    assert np.allclose(kalman_filter.error_covariance, kalman_filter.error_covariance.T)
+
+    # without visible landmarks there is nothing to correct
+    kalman_filter.correct_visible(np.empty(0), landmarks, np.zeros(6, dtype=bool))
+    assert np.allclose(kalman_filter.state_estimate, subset.state_estimate)
+
+def test_filter_bank_matches_single_filters():
+    rng = np.random.default_rng(1)
+    landmarks = rng.uniform(0, 100, size=(5, 2))
+    num_filters = 4
+    states = rng.uniform(20, 80, size=(num_filters, 3))
+    covariances = np.stack([np.diag(rng.uniform(0.5, 2, 3)) for _ in range(num_filters)])
+    R = np.diag(rng.uniform(0.01, 0.1, 10))
+    B = rng.uniform(-1, 1, size=(3, 2))
+    controls = rng.uniform(0, 1, size=(num_filters, 2))
+    visible = rng.random((num_filters, 5)) < 0.6
+    measurements = rng.uniform(-1, 1, size=(num_filters, 10)) + \
+        KalmanFilterBank(np.eye(3), B, np.eye(3) * 0.1, R, states, covariances).h(states, landmarks)
+
+    bank = KalmanFilterBank(np.eye(3), B, np.eye(3) * 0.1, R, states, covariances)
+    bank.predict(controls)
+    bank.correct(measurements, landmarks, visible)
+
+    for i in range(num_filters):
+        kalman_filter = KalmanFilter(np.eye(3), B, None, np.eye(3) * 0.1, R.copy(), states[i], covariances[i])
+        kalman_filter.predict(controls[i])
+        rows = np.repeat(visible[i], 2)
+        kalman_filter.correct_visible(measurements[i][rows], landmarks, visible[i])
+        assert np.allclose(bank.state_estimates[i], kalman_filter.state_estimate)
+        assert np.allclose(bank.error_covariances[i], kalman_filter.error_covariance)
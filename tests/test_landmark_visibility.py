@@ -0,0 +1,39 @@
+"""This test module checks the landmark_visibility module"""
+import random
+
+import numpy as np
+
+from landmark_visibility import LandmarkVisibility
+from maze import Maze
+from raycast import line_of_sight
+from robot import Robot
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
+
+
+class TestLandmarkVisibility:
+    """Test the precomputed landmark visibility"""
+    def test_matches_line_of_sight_at_samples(self):
+        """checks that the table holds the exact line of sight at the sample positions"""
+        occupancy = np.zeros((4, 4), dtype=bool)
+        occupancy[1:3, 2] = True
+        landmarks = [(20, 60), (140, 60), (140, 140)]
+        table = LandmarkVisibility.build(occupancy, 40, 160, 160, landmarks, 10)
+
+        for x in np.arange(5, 160, 10):
+            for y in np.arange(5, 160, 10):
+                expected = line_of_sight(occupancy, 40, x, y, [20, 140, 140], [60, 60, 140])
+                assert np.array_equal(table.query(x + 4, y - 4), expected)
+
+    def test_robot_models_agree(self):
+        """checks that the table and the exact visibility models rarely disagree in a maze"""
+        random.seed(0)
+        np.random.seed(0)
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        disagreements = 0
+        for _ in range(200):
+            robot.x, robot.y = np.random.uniform(0, WIDTH), np.random.uniform(0, HEIGHT)
+            robot.visibility_model = "table"
+            table = robot.visible_landmarks()
+            robot.visibility_model = "grid"
+            disagreements += np.count_nonzero(table != robot.visible_landmarks())
+        assert disagreements / (200 * len(robot.maze.landmarks)) < 0.02
@@ -0,0 +1,26 @@
+"""This test module checks the mask_cache module"""
+from mask_cache import MaskCache
+
+
+class TestMaskCache:
+    """Test the cache of collision masks"""
+    def test_hits_and_misses(self):
+        """checks that a mask is built once and then served from the cache"""
+        cache = MaskCache(max_size=4)
+        first = cache.wall_mask(40, 40)
+        second = cache.wall_mask(40, 40)
+        assert first is second
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert first.count() == 40 * 40
+
+    def test_eviction(self):
+        """checks that the least recently used mask is evicted when the cache is full"""
+        cache = MaskCache(max_size=2)
+        robot_mask = cache.robot_mask(13)
+        cache.wall_mask(40, 40)
+        cache.robot_mask(13)
+        cache.wall_mask(20, 20)  # evicts the 40 x 40 wall mask
+
+        assert cache.robot_mask(13) is robot_mask
+        cache.wall_mask(40, 40)
+        assert cache.misses == 4
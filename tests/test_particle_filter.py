@@ -0,0 +1,144 @@
+"""This test module checks the particle_filter module"""
+import random
+
+import numpy as np
+
+from particle_filter import ParticleFilter
+from maze import Maze
+from robot import Robot
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
+
+
+def make_filter(num_particles=2000, state=(50.0, 50.0, 0.0), initial_std=(10.0, 10.0, 0.2), seed=0):
+    """particle filter without walls for the tests"""
+    return ParticleFilter(num_particles, state, initial_std, 0.05, 1.0, 0.02,
+                          rng=np.random.default_rng(seed))
+
+
+def measure(state, landmarks):
+    """exact bearing and distance measurements of the landmarks from a state"""
+    landmarks = np.asarray(landmarks, dtype=float)
+    dx, dy = landmarks[:, 0] - state[0], landmarks[:, 1] - state[1]
+    measurements = np.empty(2 * len(landmarks))
+    measurements[0::2] = np.arctan2(dy, dx) - state[2]
+    measurements[1::2] = np.sqrt(dx ** 2 + dy ** 2)
+    return measurements
+
+
+class TestParticleFilter:
+    """Test the particle filter localization"""
+    def test_converges_to_true_state(self):
+        """checks that the estimate follows the robot moved with the same wheel commands"""
+        landmarks = [(0, 0), (100, 0), (0, 100), (100, 100)]
+        particle_filter = make_filter()
+        true_state = np.array([55.0, 45.0, 0.1])
+        for _ in range(10):
+            particle_filter.predict([[1.0, 1.0], [1.0, 1.0]])
+            true_state[:2] += 2 * np.array([np.cos(true_state[2]), np.sin(true_state[2])])
+            particle_filter.correct(measure(true_state, landmarks), landmarks)
+        assert np.allclose(particle_filter.state_estimate[:2], true_state[:2], atol=2.0)
+        assert abs(particle_filter.state_estimate[2] - true_state[2]) < 0.1
+        assert np.all(np.linalg.eigvalsh(particle_filter.error_covariance) >= 0)
+
+    def test_visible_subset(self):
+        """checks that the measurements only cover the visible landmarks"""
+        landmarks = [(0, 0), (100, 0), (0, 100), (100, 100)]
+        visible = np.array([True, False, False, True])
+        true_state = np.array([40.0, 60.0, 0.0])
+        particle_filter = make_filter(state=true_state)
+        before = particle_filter.state_estimate.copy()
+        particle_filter.correct(measure(true_state, np.asarray(landmarks)[visible]), landmarks, visible)
+        assert np.linalg.norm(particle_filter.state_estimate[:2] - true_state[:2]) \
+            <= np.linalg.norm(before[:2] - true_state[:2]) + 1.0
+
+        # without visible landmarks the weights are unchanged
+        weights = particle_filter.weights.copy()
+        particle_filter.correct(np.empty(0), landmarks, np.zeros(4, dtype=bool))
+        assert np.allclose(particle_filter.weights, weights)
+
+    def test_low_variance_resampling(self):
+        """checks that resampling keeps the particle count and copies particles by their weight"""
+        particle_filter = make_filter(num_particles=1000)
+        particle_filter.weights = np.zeros(1000)
+        particle_filter.weights[[3, 7]] = [0.25, 0.75]
+        kept = particle_filter.particles[[3, 7]].copy()
+        particle_filter.resample()
+        assert particle_filter.particles.shape == (1000, 3)
+        assert np.allclose(particle_filter.weights, 1 / 1000)
+        counts = [np.count_nonzero(np.all(particle_filter.particles == row, axis=1)) for row in kept]
+        assert counts == [250, 750]
+
+    def test_particles_stop_at_walls(self):
+        """checks that the particles collide with the walls and that a cloud stuck inside the
+        walls is still weighted by the measurements"""
+        occupancy = np.zeros((4, 4), dtype=bool)
+        occupancy[:, 2] = True
+        particle_filter = ParticleFilter(500, (50.0, 60.0, 0.0), (2.0, 2.0, 0.01), 0.05, 1.0, 0.02,
+                                         occupancy, 40, radius=10, rng=np.random.default_rng(0))
+        for _ in range(50):
+            particle_filter.predict([2.0, 2.0])
+        assert np.all(particle_filter.particles[:, 0] < 80.0) # the wall starts at x = 80
+
+        landmarks = [(10.0, 10.0), (150.0, 150.0)]
+        particle_filter.particles[:, 0] = 100.0
+        particle_filter.particles[:, 1] = np.linspace(10, 150, 500)
+        particle_filter.correct(measure((100.0, 60.0, 0.0), landmarks), landmarks)
+        assert abs(particle_filter.state_estimate[1] - 60.0) < 5.0
+
+    def test_robot_drives_into_wall(self):
+        """checks that the estimate stays with a robot pushing against a wall"""
+        random.seed(0)
+        np.random.seed(0)
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        robot.localizer = "particle"
+        robot.particle_count = 2000
+        for step in range(300):
+            robot.move_with_diff_drive(2, 2)
+            if step % 15 == 14:
+                robot.run_kalman_filter(2, 2)
+        assert robot.x < CELL_SIZE * 2 # blocked by the wall of the start cell
+        assert np.hypot(robot.x - robot.state_estimate[0], robot.y - robot.state_estimate[1]) < CELL_SIZE / 2
+        particles = robot.particle_filter.particles
+        cells = (particles[:, 1] // CELL_SIZE).astype(int), (particles[:, 0] // CELL_SIZE).astype(int)
+        assert not robot.maze.occupancy()[cells].any()
+
+    def test_robot_localizer(self):
+        """checks that the robot localizes with the particle filter when it is selected"""
+        random.seed(0)
+        np.random.seed(0)
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        robot.localizer = "particle"
+        robot.particle_count = 2000
+        for _ in range(5):
+            for _ in range(3):
+                robot.move_with_diff_drive(1, 1.2)
+            robot.run_kalman_filter(1, 1.2)
+            assert robot.beacon_count.last() == robot.visible_landmarks().sum()
+        assert len(robot.estimated_positions) == 6
+        assert robot.state_estimate is robot.particle_filter.state_estimate
+        assert np.hypot(robot.x - robot.state_estimate[0], robot.y - robot.state_estimate[1]) < CELL_SIZE
+
+        robot.reset()
+        assert robot.particle_filter is None
+        assert robot.state_estimate is robot.kalman_filter.state_estimate
+
+    def test_robot_bearings_are_wrapped(self):
+        """checks that the measured bearings and their noise stay within half a turn"""
+        random.seed(0)
+        np.random.seed(0)
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        robot.localizer = "particle"
+        robot.particle_count = 100
+        robot.sensor_noise = 0.5
+        robot.run_kalman_filter(0, 0)
+        measurements = []
+        robot.particle_filter.correct = lambda measurement_vector, *_: measurements.append(measurement_vector)
+        # move to a cell center with landmarks in sight
+        for robot.x, robot.y in ((x, y) for x in range(20, WIDTH, 40) for y in range(20, HEIGHT, 40)):
+            if robot.visible_landmarks().any():
+                break
+        for angle in np.linspace(0, 2 * np.pi, 20, endpoint=False):
+            robot.angle = angle
+            robot.run_kalman_filter(0, 0)
+        bearings = np.concatenate([measurement[0::2] for measurement in measurements])
+        assert len(bearings) and np.all(np.abs(bearings) <= 1.5 * np.pi)
@@ -0,0 +1,84 @@
+"""This test module checks the raycast module"""
+import random
+
+import numpy as np
+
+from maze import Maze
+from robot import Robot
+from raycast import batch_raycast, dda_raycast, line_of_sight
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
+
+
+class TestBatchRaycast:
+    """Test the vectorized raycasting engine"""
+    def test_hits_wall_in_empty_room(self):
+        """checks that a ray in a walled room stops at the wall"""
+        occupancy = np.ones((5, 5), dtype=bool)
+        occupancy[1:4, 1:4] = False
+
+        # ray to the east from the center of the room, the wall starts at x = 160
+        distance = batch_raycast(occupancy, 40, 100.5, 100.5, 0.0, 1000)
+        assert distance == 60
+
+    def test_max_distance(self):
+        """checks that the maximum distance is returned when no wall is hit"""
+        occupancy = np.zeros((5, 5), dtype=bool)
+        distance = batch_raycast(occupancy, 40, 100.5, 100.5, 0.0, 10)
+        assert distance == 10
+
+    def test_matches_pixel_raycast(self):
+        """checks that the batch sensor model matches the per pixel sensor model"""
+        random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        robot = Robot(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+
+        for angle in np.linspace(0, 2 * np.pi, 7):
+            robot.angle = angle
+            robot.sensor_model = "step"
+            robot.update_sensors()
+            expected = list(robot.sensors)
+
+            robot.sensor_model = "batch"
+            robot.update_sensors()
+            assert np.allclose(robot.sensors, expected, atol=1)
+
+
+class TestDdaRaycast:
+    """Test the exact grid traversal"""
+    def test_exact_distance(self):
+        """checks that the hit distance is computed exactly"""
+        occupancy = np.ones((5, 5), dtype=bool)
+        occupancy[1:4, 1:4] = False
+
+        # ray to the east and a diagonal ray, the wall starts at x = 160 and y = 160
+        distances = dda_raycast(occupancy, 40, 100.5, 100.5, [0.0, np.pi / 4], 1000)
+        assert np.allclose(distances, [59.5, 59.5 * np.sqrt(2)])
+
+    def test_max_distance(self):
+        """checks that the maximum distance is returned when no wall is hit"""
+        occupancy = np.zeros((5, 5), dtype=bool)
+        assert dda_raycast(occupancy, 40, 100.5, 100.5, np.pi, 10) == 10
+
+    def test_line_of_sight(self):
+        """checks that walls between origin and target block the line of sight"""
+        occupancy = np.zeros((5, 5), dtype=bool)
+        occupancy[2, 2] = True
+        visible = line_of_sight(occupancy, 40, 20, 100, [180, 100], [100, 20])
+        assert visible.tolist() == [False, True]
+
+    def test_matches_pixel_raycast(self):
+        """checks that the dda sensor model is at most 1 px shorter than the per pixel model"""
+        random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        robot = Robot(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+
+        for angle in np.linspace(0, 2 * np.pi, 7):
+            robot.angle = angle
+            robot.sensor_model = "step"
+            robot.update_sensors()
+            expected = np.array(robot.sensors)
+
+            robot.sensor_model = "dda"
+            robot.update_sensors()
+            difference = expected - np.array(robot.sensors)
+            assert np.all((difference >= 0) & (difference <= 1 + 1e-9))
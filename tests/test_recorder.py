@@ -0,0 +1,36 @@
+"""This test module checks the recorder module"""
+import random
+
+import numpy as np
+
+from ann import ANNController
+from fitness import fitness
+from maze import Maze
+from recorder import TrajectoryRecorder, TrajectoryReader
+from robot import Robot
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
+
+
+class TestTrajectoryRecorder:
+    """Test the binary recording and the memory-mapped replay"""
+    def test_round_trip(self, tmp_path):
+        """checks that recorded rollouts are read back step by step"""
+        random.seed(0)
+        np.random.seed(0)
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        controller = ANNController(12, 10, 2)
+
+        with TrajectoryRecorder(tmp_path / "run", chunk_size=64) as recorder:
+            fitness(robot, controller, steps=100, recorder=recorder)
+            path = robot.past_positions.view().copy()
+            fitness(robot, controller, steps=30, recorder=recorder)
+            last_sensors = np.array(robot.sensors)
+
+        reader = TrajectoryReader(tmp_path / "run")
+        assert len(reader) == 2
+        assert reader.rows == 130
+        first = reader.rollout(0)
+        assert isinstance(reader["x"], np.memmap)
+        assert np.array_equal(first["step"], np.arange(100))
+        assert np.allclose(np.stack([first["x"], first["y"]], axis=1), path[1:])
+        assert np.allclose(reader.rollout(-1)["sensors"][-1], last_sensors)
@@ -0,0 +1,38 @@
+"""This test module checks the replay module"""
+import random
+
+import numpy as np
+import pygame
+
+from ann import ANNController
+from fitness import fitness
+from maze import Maze
+from recorder import TrajectoryRecorder
+from replay import ReplayViewer
+from robot import Robot
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
+
+
+class TestReplayViewer:
+    """Test the rendering of recorded rollouts"""
+    def test_seek_and_save_frame(self, tmp_path):
+        """checks seeking in both directions and saving the final frame"""
+        random.seed(0)
+        np.random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        robot = Robot(maze, (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        with TrajectoryRecorder(tmp_path / "run", estimate=False) as recorder:
+            fitness(robot, ANNController(12, 10, 2), steps=50, recorder=recorder)
+
+        viewer = ReplayViewer(maze, tmp_path / "run")
+        assert len(viewer) == 50
+        assert "estimate" not in viewer.steps
+        assert viewer.seek(-1) == 49
+        assert viewer.seek(10) == 10
+        assert viewer.seek(-100) == 0
+        assert viewer.seek(1000) == 49
+
+        viewer.save_frame(tmp_path / "final.png")
+        image = pygame.image.load(tmp_path / "final.png")
+        assert image.get_size() == (WIDTH, HEIGHT)
+        assert np.allclose((viewer.robot.x, viewer.robot.y), (robot.x, robot.y))
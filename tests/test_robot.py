@@ -0,0 +1,72 @@
+"""This test module checks the robot module"""
+import random
+
+import numpy as np
+
+from maze import Maze
+from robot import Robot
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
+
+
+class TestExploredArea:
+    """Test the incremental explored cell bookkeeping"""
+    def test_matches_past_positions(self):
+        """checks that the running count equals the cells of the recorded positions"""
+        random.seed(0)
+        np.random.seed(0)
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+        for _ in range(300):
+            robot.move_with_diff_drive(*np.random.uniform(0, 3, 2))
+
+        cells = {(int(x // CELL_SIZE), int(y // CELL_SIZE)) for x, y in robot.past_positions}
+        assert robot.calculate_explored_area() == len(cells) == robot.explored_grid.sum()
+        assert len(robot.coverage) == len(robot.past_positions)
+        assert robot.coverage[-1] == len(cells)
+        assert (np.diff(robot.coverage.view()) >= 0).all()
+
+        robot.reset()
+        assert robot.calculate_explored_area() == 1
+        assert robot.coverage.view().tolist() == [1]
+
+
+class TestKalmanCorrection:
+    """Test the Kalman filter corrections of the robot"""
+    def test_correction_modes(self):
+        """checks that both correction modes count the visible landmarks and update the estimate"""
+        for mode in ("visible", "full"):
+            random.seed(0)
+            np.random.seed(0)
+            robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5))
+            robot.kalman_correction = mode
+            for _ in range(20):
+                robot.move_with_diff_drive(1, 1.2)
+                robot.run_kalman_filter(1, 1.2)
+                assert robot.beacon_count.last() == robot.visible_landmarks().sum()
+            assert len(robot.estimated_positions) == 21
+            assert np.all(np.linalg.eigvalsh(robot.kalman_filter.error_covariance) > 0)
+
+
+class TestPlotError:
+    """Test the alignment of the estimates with the past positions"""
+    def test_steps_align_after_ring_buffer_wraps(self):
+        """checks that every plotted error pairs an estimate with the position of its own step"""
+        import matplotlib # pylint: disable=import-outside-toplevel
+        matplotlib.use("Agg")
+        random.seed(0)
+        np.random.seed(0)
+        robot = Robot(Maze(WIDTH, HEIGHT, CELL_SIZE), (CELL_SIZE * 1.5, CELL_SIZE * 1.5), 50)
+        positions, estimate_steps = [(robot.x, robot.y)], [0]
+        for step in range(1, 201):
+            robot.move_with_diff_drive(1, 1.2)
+            positions.append(tuple(robot.past_positions.last()))
+            if step % 15 == 0:
+                robot.run_kalman_filter(1, 1.2)
+                estimate_steps.append(step)
+
+        past_indices, plot = robot.plot_error()
+        plot.close()
+        kept = [step for step in estimate_steps if step > 200 - 50]
+        assert past_indices.tolist() == kept
+        first_step = 200 - 49
+        past = robot.past_positions.view()[past_indices - first_step]
+        assert np.allclose(past, np.asarray([positions[step] for step in kept], dtype=np.float32))
@@ -0,0 +1,83 @@
+"""This test module checks the sensor_table module"""
+import random
+
+import numpy as np
+import pytest
+
+from maze import Maze
+from raycast import dda_raycast
+from sensor_table import SensorTable, load_or_build, read_header
+from config.maze_config import WIDTH, HEIGHT, CELL_SIZE
+
+
+@pytest.fixture
+def occupancy():
+    """a walled room of 3 x 3 free cells"""
+    grid = np.ones((5, 5), dtype=bool)
+    grid[1:4, 1:4] = False
+    return grid
+
+
+class TestSensorTable:
+    """Test the precomputed sensor lookup table"""
+    def test_lookup_on_sample_position(self, occupancy):
+        """checks that a lookup on a sample position returns the raycast distance"""
+        table = SensorTable.build(occupancy, 40, 200, 200, 4, 8, 1000)
+        angles = np.arange(8) * (2 * np.pi / 8)
+        expected = dda_raycast(occupancy, 40, 100, 80, angles, 1000)
+        assert np.allclose(table.lookup(100, 80, angles), expected)
+        assert np.allclose(table.lookup(100, 80, angles, interpolate=True), expected)
+
+    def test_memory_budget(self, occupancy):
+        """checks that a table over the memory budget is refused"""
+        with pytest.raises(ValueError):
+            SensorTable.build(occupancy, 40, 200, 200, 1, 360, 1000, max_bytes=1024)
+
+    def test_save_and_load(self, occupancy, tmp_path):
+        """checks that a saved table is memory-mapped with the same distances"""
+        table = SensorTable.build(occupancy, 40, 200, 200, 4, 8, 1000)
+        path = tmp_path / "table.npy"
+        table.save(path)
+
+        loaded = SensorTable.load(path, 4)
+        assert isinstance(loaded.distances, np.memmap)
+        assert np.array_equal(loaded.distances, table.distances)
+
+
+class TestSensorTableFile:
+    """Test the reuse of the sensor tables saved to disk"""
+    @pytest.fixture(autouse=True)
+    def small_tables(self, monkeypatch):
+        """coarse tables so the maze tables build quickly"""
+        monkeypatch.setattr("maze.SENSOR_TABLE_RESOLUTION", 40)
+        monkeypatch.setattr("maze.SENSOR_TABLE_ANGLE_BINS", 8)
+
+    def test_stale_table_is_rebuilt(self, tmp_path):
+        """checks that a table saved for another maze or other settings is not reused"""
+        random.seed(0)
+        first, second = Maze(WIDTH, HEIGHT, CELL_SIZE), Maze(WIDTH, HEIGHT, CELL_SIZE)
+        path = tmp_path / "table.npy"
+        first.sensor_table(path)
+        assert read_header(path)["maze"] == first.fingerprint()
+
+        table = load_or_build(second, path, 40, 8, 1000)
+        expected = SensorTable.build(second.occupancy(), CELL_SIZE, WIDTH, HEIGHT, 40, 8, 1000)
+        assert np.array_equal(table.distances, expected.distances)
+        assert read_header(path)["maze"] == second.fingerprint()
+
+        # same maze, other angle bins
+        assert load_or_build(second, path, 40, 4, 1000).angle_bins == 4
+        assert isinstance(load_or_build(second, path, 40, 4, 1000).distances, np.memmap)
+
+    def test_new_path_reloads_table(self, tmp_path):
+        """checks that asking for the table at another path does not return the cached one"""
+        random.seed(0)
+        maze = Maze(WIDTH, HEIGHT, CELL_SIZE)
+        maze.sensor_table()
+        maze.sensor_table(tmp_path / "table.npy")
+        assert (tmp_path / "table.npy").exists()
+        table = maze.sensor_table()
+        assert maze.sensor_table(tmp_path / "table.npy") is table
+        maze.sensor_table(tmp_path / "other.npy")
+        assert (tmp_path / "other.npy").exists()
+        assert maze.sensor_table() is not table
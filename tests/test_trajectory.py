@@ -0,0 +1,34 @@
+"""This test module checks the trajectory module"""
+import numpy as np
+
+from trajectory import Trajectory
+
+
+class TestTrajectory:
+    """Test the preallocated trajectory store"""
+    def test_unbounded_keeps_every_row(self):
+        """checks that the chunked mode grows past its chunks and keeps the order"""
+        trajectory = Trajectory(2, chunk_size=8)
+        rows = np.arange(50, dtype=np.float32).reshape(25, 2)
+        for i, row in enumerate(rows):
+            trajectory.append(row)
+            if i == 12:
+                assert np.array_equal(trajectory.view(), rows[:13])
+            assert np.array_equal(trajectory.last(), row)
+        assert len(trajectory) == 25
+        assert np.array_equal(trajectory.view(), rows)
+
+        trajectory.clear()
+        trajectory.append((1, 2))
+        assert trajectory.view().tolist() == [[1, 2]]
+
+    def test_ring_buffer_keeps_last_rows(self):
+        """checks that the ring mode keeps the last capacity rows as a view"""
+        trajectory = Trajectory(None, capacity=5, dtype=np.int32)
+        for value in range(12):
+            trajectory.append(value)
+            assert trajectory.view().tolist() == list(range(max(0, value - 4), value + 1))
+        assert trajectory.view().base is not None # no copy
+        assert trajectory[0] == 7
+        assert trajectory.last() == 11
+        assert trajectory.appended == 12 and len(trajectory) == 5
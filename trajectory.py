@@ -0,0 +1,111 @@
+"""
+trajectory.py: Preallocated store for the positions and counters recorded every step.
+"""
+
+import numpy as np
+
+TRAJECTORY_CHUNK_SIZE = 4096
+
+
+class Trajectory:
+    """
+    Sequence of fixed size rows (for example (x, y) positions) in preallocated float32 arrays.
+    With a capacity it is a ring buffer keeping the last capacity rows, for long interactive
+    sessions. Without one it grows by whole chunks and keeps everything, for training.
+    view() returns the rows as one numpy array without converting them to lists.
+    """
+
+    def __init__(self, columns=2, capacity=None, chunk_size=TRAJECTORY_CHUNK_SIZE,
+                 dtype=np.float32):
+        """
+        Initialize an empty trajectory.
+        :param columns: Number of values per row, None for a sequence of scalars.
+        :param capacity: Number of rows kept in ring buffer mode, None keeps every row.
+        :param chunk_size: Number of rows allocated at once in the unbounded mode.
+        :param dtype: dtype of the stored values.
+        """
+        self.columns = columns
+        self.capacity = capacity
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+        shape = () if columns is None else (columns,)
+        if capacity is not None:
+            # every row is written twice, at i and i + capacity, so the last capacity rows are
+            # always contiguous in the buffer and view() never copies
+            self._buffer = np.empty((2 * capacity,) + shape, dtype=dtype)
+        else:
+            self._chunks = [np.empty((chunk_size,) + shape, dtype=dtype)]
+            self._chunk_start = 0 # index of the first row of the last chunk
+        self._shape = shape
+        self._length = 0 # rows in the unbounded mode, rows ever written in the ring mode
+
+    def __len__(self):
+        if self.capacity is not None:
+            return min(self._length, self.capacity)
+        return self._length
+
+    @property
+    def appended(self):
+        """Number of rows appended since the last clear, including the ones the ring buffer dropped."""
+        return self._length
+
+    def append(self, row):
+        """Add a row at the end, in ring buffer mode the oldest row is dropped when full."""
+        if self.capacity is not None:
+            index = self._length % self.capacity
+            self._buffer[index] = row
+            self._buffer[index + self.capacity] = row
+        else:
+            offset = self._length - self._chunk_start
+            if offset == len(self._chunks[-1]):
+                self._chunks.append(np.empty((self.chunk_size,) + self._shape, dtype=self.dtype))
+                self._chunk_start = self._length
+                offset = 0
+            self._chunks[-1][offset] = row
+        self._length += 1
+
+    def clear(self):
+        """Remove every row, keeping the allocated memory."""
+        self._length = 0
+        if self.capacity is None:
+            del self._chunks[1:]
+            self._chunk_start = 0
+
+    def view(self):
+        """
+        Return the rows, oldest first, as one array. In ring buffer mode it is a view into the
+        buffer; in the unbounded mode the chunks are merged into one array first if needed.
+        The view is only valid until the next append.
+        """
+        if self.capacity is not None:
+            start = self._length % self.capacity if self._length > self.capacity else 0
+            return self._buffer[start:start + len(self)]
+        if len(self._chunks) > 1:
+            self._merge_chunks()
+        return self._chunks[0][:self._length]
+
+    def last(self):
+        """Return the most recent row."""
+        if not len(self):
+            raise IndexError("empty trajectory")
+        if self.capacity is not None:
+            return self._buffer[(self._length - 1) % self.capacity]
+        return self._chunks[-1][self._length - 1 - self._chunk_start]
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def _merge_chunks(self):
+        """Copy the chunks into one chunk with room for at least one more chunk of rows."""
+        size = (self._length // self.chunk_size + 1) * self.chunk_size
+        merged = np.empty((size,) + self._shape, dtype=self.dtype)
+        start = 0
+        for chunk in self._chunks:
+            rows = min(len(chunk), self._length - start)
+            merged[start:start + rows] = chunk[:rows]
+            start += rows
+        self._chunks = [merged]
+        self._chunk_start = 0